@@ -4,14 +4,46 @@ GitMentor CLI - Professional Version
 Extended with History Tracking, AI Explanation, and Commit Documentation
 """
 import click
-import subprocess
+import contextlib
 import os
-from rich.console import Console
-from rich.panel import Panel
+import sys
+from functools import lru_cache
 
-console = Console()
+# Both front ends share main.py's grammar constants instead of keeping copies
+from main import BRANCH_TYPES, EXPLAIN_LEVELS, EXPLAIN_TYPES
 
-@click.group()
+
+@lru_cache(maxsize=1)
+def _console():
+    """Build the Rich console on first use so `--help` never imports rich."""
+    from rich.console import Console
+    return Console()
+
+
+_BRANCH_TYPE_CHOICE = click.Choice(BRANCH_TYPES)
+
+
+class _CommandRegistry(click.Group):
+    """Group whose name -> command map also keeps a presorted listing for --help."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sorted_names = None
+
+    def add_command(self, cmd, name=None):
+        super().add_command(cmd, name)
+        self._sorted_names = None
+
+    def get_command(self, ctx, cmd_name):
+        return self.commands.get(cmd_name)
+
+    def list_commands(self, ctx):
+        if self._sorted_names is None:
+            self._sorted_names = tuple(sorted(self.commands))
+        return self._sorted_names
+
+
+@click.group(cls=_CommandRegistry)
 def cli():
     """🚀 GitMentor - Your Autonomous Code Steward"""
     pass
@@ -21,83 +53,126 @@ def cli():
 # CORE PIPELINE COMMANDS
 # ============================================================================
 
-@cli.command()
-@click.option('--intent', '-m', help='Commit intent/rationale for the AI')
-def commit(intent):
-    """Generate Conventional Commit + detailed tracking documentation"""
-    # Check for staged changes first
-    result = subprocess.run(
-        ['git', 'diff', '--cached', '--quiet'],
-        capture_output=True
-    )
-    
-    if result.returncode == 0:
-        console.print("[red]❌ No staged changes found[/red]")
-        console.print("[yellow]Hint: Use 'git add <files>' to stage changes first[/yellow]")
-        return
-    
-    # Pass to main.py logic
-    cmd = ['python', 'main.py', 'commit']
-    if intent:
-        cmd.extend(['--intent', intent])
-    
-    subprocess.run(cmd)
+# Each pipeline command is a thin in-process wrapper around main.run(),
+# so they are described as data and registered in a single loop.
+_TARGET_OPTION = ('--target', '-t')
+_INTENT_OPTION = ('--intent', '-m')
+_NO_CACHE_OPTION = (('--no-cache',), {'is_flag': True, 'help': 'Ignore cached LLM responses and regenerate'})
 
+COMMANDS = [
+    {
+        'name': 'commit',
+        'mode': 'commit',
+        'help': 'Generate Conventional Commit + detailed tracking documentation',
+        'options': [(_INTENT_OPTION, {'help': 'Commit intent/rationale for the AI'}), _NO_CACHE_OPTION],
+    },
+    {
+        'name': 'pr',
+        'mode': 'pr',
+        'help': 'Generate high-quality PR documentation using commit tracking history',
+        'options': [
+            (_TARGET_OPTION, {'default': 'main', 'help': 'Base branch for the PR'}),
+            (_INTENT_OPTION, {'help': 'PR overarching intent'}),
+            _NO_CACHE_OPTION,
+        ],
+    },
+    {
+        'name': 'docs',
+        'mode': 'docs',
+        'help': "Generate technical 'System Blueprint' documentation (CODE_DOCS.md)",
+        'options': [_NO_CACHE_OPTION],
+    },
+    {
+        'name': 'audit',
+        'mode': 'audit',
+        'help': 'Run professional quality and security audit (Steward)',
+        'options': [(_TARGET_OPTION, {'default': 'main', 'help': 'Comparison branch'})],
+    },
+    {
+        'name': 'full',
+        'mode': 'full',
+        'help': 'Run full analysis swarm and sync README with codebase reality',
+        'options': [
+            (_TARGET_OPTION, {'default': 'main', 'help': 'Comparison branch'}),
+            (_INTENT_OPTION, {'help': 'Release/Project intent'}),
+            _NO_CACHE_OPTION,
+        ],
+    },
+]
 
-@cli.command()
-@click.option('--target', '-t', default='main', help='Base branch for the PR')
-@click.option('--intent', '-m', help='PR overarching intent')
-def pr(target, intent):
-    """Generate high-quality PR documentation using commit tracking history"""
-    cmd = ['python', 'main.py', 'pr', '--target-branch', target]
-    if intent:
-        cmd.extend(['--intent', intent])
-    subprocess.run(cmd)
 
+def _make_cmd(spec: dict) -> click.Command:
+    """Build a Click command that forwards its options to main.run(mode=spec['mode'])."""
+    def callback(target=None, intent=None, no_cache=False):
+        kwargs = {'intent': intent, 'no_cache': no_cache}
+        if target is not None:
+            kwargs['target_branch'] = target
 
-@cli.command()
-def docs():
-    """Generate technical 'System Blueprint' documentation (CODE_DOCS.md)"""
-    subprocess.run(['python', 'main.py', 'docs'])
+        from main import run
+        run(mode=spec['mode'], **kwargs)
 
+    params = [click.Option(list(decls), **attrs) for decls, attrs in spec['options']]
+    return click.Command(spec['name'], callback=callback, params=params, help=spec['help'])
 
-@cli.command()
-@click.option('--target', '-t', default='main', help='Comparison branch')
-def audit(target):
-    """Run professional quality and security audit (Steward)"""
-    subprocess.run(['python', 'main.py', 'audit', '--target-branch', target])
 
+for _spec in COMMANDS:
+    cli.add_command(_make_cmd(_spec))
 
-@cli.command()
-@click.option('--target', '-t', default='main', help='Comparison branch')
-@click.option('--intent', '-m', help='Release/Project intent')
-def full(target, intent):
-    """Run full analysis swarm and sync README with codebase reality"""
-    cmd = ['python', 'main.py', 'full', '--target-branch', target]
-    if intent:
-        cmd.extend(['--intent', intent])
-    subprocess.run(cmd)
+
+@lru_cache(maxsize=1)
+def _branch_success_template():
+    """Static parts of the success panel, lexed once; only the names are filled per run."""
+    from rich.text import Text
+    return (
+        Text.from_markup("[bold green]✅ Branch Ready![/bold green]\n\n🌿 Branch: "),
+        Text.from_markup("\n🏷️  Type: "),
+        Text.from_markup(
+            "\n\nNext steps:\n"
+            "  [dim]1. Write code changes[/dim]\n"
+            "  [dim]2. git add .[/dim]\n"
+            "  [dim]3. gm commit[/dim]"
+        ),
+    )
 
 
 @cli.command()
-@click.option('--intent', '-m', prompt='What is the purpose of this branch?', help='Branch purpose/intent')
-@click.option('--type', '-t', type=click.Choice([
-    'feat', 'fix', 'hotfix', 'refactor', 'perf', 
-    'docs', 'test', 'chore', 'style', 'ci', 'build'
-]), help='Explicitly set branch type')
+@click.option('--intent', '-m', help='Branch purpose/intent')
+@click.option('--type', '-t', type=_BRANCH_TYPE_CHOICE, help='Explicitly set branch type')
 @click.option('--no-commit', is_flag=True, help='Skip the initial semantic commit')
 def branch(intent, type, no_commit):
     """Create a semantically named branch based on intent"""
+    if not intent:
+        # Never block on stdin in CI or under the warm worker
+        if not sys.stdin.isatty():
+            raise click.UsageError('--intent required in non-interactive mode')
+        intent = click.prompt('What is the purpose of this branch?')
+
     # Using python directly to leverage the BranchManager tool
-    from src.tools.gitops import GitOps
+    from src.tools.gitops import get_git_ops
     from src.tools.branch_manager import BranchManager
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.text import Text
+
+    console = _console()
+    # One render pass for the banner and the request summary
+    console.print(Group(
+        Panel("🌿 [bold green]GitMentor: Smart Branch Creator[/bold green]", border_style="green"),
+        Text(f"💭 Intent: {intent}"),
+        Text(f"🏷️  Type: {type or 'auto-detect'}", style="dim"),
+    ))
     
-    console.print(Panel("🌿 [bold green]GitMentor: Smart Branch Creator[/bold green]", border_style="green"))
-    
-    git_ops = GitOps(os.getcwd())
+    git_ops = get_git_ops(os.getcwd())
     manager = BranchManager(git_ops)
     
-    with console.status("[bold yellow]AI is determining branch strategy...[/bold yellow]"):
+    message = "[bold yellow]AI is determining branch strategy...[/bold yellow]"
+    if console.is_terminal:
+        status = console.status(message)
+    else:
+        # No spinner thread when the output is a pipe or CI log
+        console.print(message)
+        status = contextlib.nullcontext()
+    with status:
         try:
             branch_name, branch_type = manager.create_smart_branch(
                 user_intent=intent,
@@ -105,20 +180,20 @@ def branch(intent, type, no_commit):
                 suggested_type=type,
                 create_initial_commit=(not no_commit)
             )
-            
-            console.print(Panel(
-                f"[bold green]✅ Branch Ready![/bold green]\n\n"
-                f"🌿 Branch: [cyan]{branch_name}[/cyan]\n"
-                f"🏷️  Type: [yellow]{branch_type}[/yellow]\n\n"
-                f"Next steps:\n"
-                f"  [dim]1. Write code changes[/dim]\n"
-                f"  [dim]2. git add .[/dim]\n"
-                f"  [dim]3. gm commit[/dim]",
-                border_style="green",
-                title="Success"
-            ))
         except Exception as e:
-            console.print(f"[red]❌ Error creating branch: {e}[/red]")
+            branch_name, error = None, e
+
+    # Render the outcome once, after the spinner has stopped
+    if branch_name is None:
+        console.print(f"[red]❌ Error creating branch: {error}[/red]")
+        return
+
+    head, middle, tail = _branch_success_template()
+    console.print(Panel(
+        Text.assemble(head, (branch_name, "cyan"), middle, (branch_type, "yellow"), tail),
+        border_style="green",
+        title="Success"
+    ))
 
 
 # ============================================================================
@@ -129,35 +204,104 @@ def branch(intent, type, no_commit):
 @click.argument('query', nargs=-1, required=True)
 def search_history(query):
     """Search git history for specific logic or variable evolutions"""
-    query_text = ' '.join(query)
-    # Forward to main.py routing
-    subprocess.run(['python', 'main.py', 'search-history'] + list(query))
+    # Forward to main.py routing (in-process)
+    from main import main
+    main(['search-history', *query])
 
 
 @cli.command()
 @click.argument('name')
 @click.option('--level', '-l', 
-              type=click.Choice(['beginner', 'medium', 'hard']), 
+              type=click.Choice(EXPLAIN_LEVELS),
               default='medium',
               help='Explanation depth')
 @click.option('--file', '-f', help='Target specific file')
 @click.option('--type', '-t', 
-              type=click.Choice(['function', 'class', 'auto']),
+              type=click.Choice(EXPLAIN_TYPES),
               default='auto')
 def explain(name, level, file, type):
     """Get a high-level or deep-dive AI explanation of code"""
-    cmd = ['python', 'main.py', 'explain', name, '--level', level, '--type', type]
+    argv = ['explain', name, '--level', level, '--type', type]
     if file:
-        cmd.extend(['--file', file])
-    subprocess.run(cmd)
+        argv.extend(['--file', file])
+    from main import main
+    main(argv)
 
 
 @cli.command()
 @click.argument('query', nargs=-1, required=True)
 def where(query):
     """Find code locations using natural language queries"""
-    subprocess.run(['python', 'main.py', 'where'] + list(query))
+    from main import main
+    main(['where', *query])
+
+
+# ============================================================================
+# WARM WORKER
+# ============================================================================
+
+def _dispatch(argv) -> int:
+    """Run one CLI invocation inside the worker without exiting it; returns the exit code."""
+    try:
+        rv = cli.main(args=argv, prog_name='gm', standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    # Without standalone mode, ctx.exit(code) comes back as the return value
+    return rv if isinstance(rv, int) else 0
+
+
+def _reset_request_state():
+    """
+    Drop process-wide state that belongs to the previous request: the parsed
+    config, repository handles, and consoles or clients built from them.
+    The compiled graph is kept; it holds no per-run state.
+    """
+    import main
+    from src.utils.config import cfg
+    from src.tools.gitops import get_git_ops
+    cfg.reset()
+    get_git_ops.cache_clear()
+    _console.cache_clear()
+    main._console.cache_clear()
+    main._ensure_env.cache_clear()
+    scribe = sys.modules.get('src.agents.scribe')
+    if scribe is not None:
+        scribe._get_creative_llm.cache_clear()
+
+
+@cli.command()
+def daemon():
+    """Run a warm worker that serves CLI commands over a Unix socket"""
+    from src.utils.daemon import is_supported, serve
+    if not is_supported():
+        raise click.ClickException("The worker needs Unix domain sockets")
+
+    # Importing src.graph loads the agents and compiles the app at module level,
+    # so that cost is paid before the first client connects and reused after
+    import src.graph  # noqa: F401
+
+    serve(_dispatch, reset=_reset_request_state)
+
+
+def _use_daemon(argv) -> bool:
+    """Opt in with GITMENTOR_DAEMON=1; the worker keeps the env it started with."""
+    return (
+        os.getenv('GITMENTOR_DAEMON') == '1'
+        and bool(argv)
+        and argv[0] not in ('daemon', '--help')
+    )
 
 
 if __name__ == '__main__':
+    argv = sys.argv[1:]
+    if _use_daemon(argv):
+        from src.utils.daemon import forward
+        spawn_cmd = [sys.executable, os.path.abspath(__file__), 'daemon']
+        code = forward(argv, spawn_cmd=spawn_cmd)
+        if code is not None:
+            sys.exit(code)
     cli()
\ No newline at end of file
@@ -1,29 +1,127 @@
 # main.py - GitMentor Autonomous Code Steward
 import os
+import sys
 import argparse
-import subprocess
-import json
-import re
-import textwrap
-from dotenv import load_dotenv
-
-from src.graph import app
-from src.utils.config import cfg
-from src.tools.gitops import GitOps
-from src.tools.branch_manager import BranchManager
-
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
-from rich.rule import Rule
-from rich.prompt import Prompt
-from rich.syntax import Syntax
-from rich.markdown import Markdown
-
-console = Console()
-load_dotenv()
-
-def main():
+import contextlib
+import importlib
+from functools import lru_cache
+from types import MappingProxyType
+
+
+@lru_cache(maxsize=1)
+def _console():
+    """Build the Rich console on first use so `--help` never imports rich."""
+    from rich.console import Console
+    # No auto-highlighting: every print would otherwise run Rich's regex highlighter
+    return Console(highlight=False)
+
+def _status(message: str, **kwargs):
+    """Spinner on a terminal; on pipes/CI print the message once and skip the render thread."""
+    console = _console()
+    if console.is_terminal:
+        return console.status(message, **kwargs)
+    console.print(message)
+    return contextlib.nullcontext()
+
+@lru_cache(maxsize=1)
+def _ensure_env():
+    """Load .env once, and only on paths that reach the LLM-backed agents."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+def _git_ops(cwd=None):
+    """The run's shared GitOps for the working directory (cached in gitops)."""
+    from src.tools.gitops import get_git_ops
+    return get_git_ops(cwd or os.getcwd())
+
+def _current_branch() -> str:
+    """HEAD of the shared handle; GitOps memoises it until a branch switch."""
+    return _git_ops().get_current_branch()
+
+PIPELINE_MODES = ("full", "audit", "docs", "pr", "commit")
+BRANCH_TYPES = (
+    'feat', 'fix', 'hotfix', 'refactor', 'perf',
+    'docs', 'test', 'chore', 'style', 'ci', 'build'
+)
+EXPLAIN_LEVELS = ('beginner', 'medium', 'hard')
+EXPLAIN_TYPES = ('function', 'class', 'auto')
+
+# Heavy targets as "module:attr" strings, imported only when a handler fires
+ENTRY_POINTS = {
+    'graph': 'src.graph:app',
+    'scribe': 'src.agents.scribe:scribe_node',
+    'readme': 'src.agents.scribe:_generate_enhanced_readme',
+    'explainer': 'src.agents.explainer:CodeExplainer',
+    'history': 'src.tools.history:HistoryAnalyzer',
+    'branch_manager': 'src.tools.branch_manager:BranchManager',
+}
+
+def _load(name: str):
+    """Resolve an ENTRY_POINTS spec to its object."""
+    module_name, attr = ENTRY_POINTS[name].split(':')
+    return getattr(importlib.import_module(module_name), attr)
+
+def _preload(name: str):
+    """
+    Start importing an ENTRY_POINTS module on a daemon thread so the cost
+    overlaps with header rendering and git lookups. The import system's
+    per-module locks make the later _load() wait for (not redo) a
+    half-finished import; failures are left for _load() to raise.
+    """
+    module_name = ENTRY_POINTS[name].split(':')[0]
+    if module_name in sys.modules:
+        return
+
+    def _import():
+        with contextlib.suppress(Exception):
+            importlib.import_module(module_name)
+
+    import threading
+    threading.Thread(target=_import, name=f"preload-{name}", daemon=True).start()
+
+
+# ========================================================================
+# SUBCOMMAND ARGUMENTS
+# ========================================================================
+
+def _add_standard_args(p):
+    """Consistent arguments for all pipeline modes."""
+    p.add_argument('--intent', '-m', help='Context or intent for the AI agents')
+    p.add_argument("--target-branch", "--target", default="main", help="Base branch for comparison")
+    p.add_argument('--no-cache', action='store_true', help='Ignore cached LLM responses and regenerate')
+
+def _add_branch_args(p):
+    p.add_argument('--intent', '-m', required=True, help='Branch purpose/intent')
+    p.add_argument('--type', '-t', choices=BRANCH_TYPES, help='Override branch type')
+    p.add_argument('--no-commit', action='store_true', help='Skip initial commit')
+
+def _add_search_history_args(p):
+    p.add_argument('query', nargs='+', help='Query (e.g., "var_name in file.py")')
+
+def _add_explain_args(p):
+    p.add_argument('name', help='Name of function or class')
+    p.add_argument('--level', '-l', choices=EXPLAIN_LEVELS, default='medium', help='Explanation complexity')
+    p.add_argument('--file', '-f', help='Specific file path')
+    p.add_argument('--type', '-t', choices=EXPLAIN_TYPES, default='auto')
+
+def _add_where_args(p):
+    p.add_argument('query', nargs='+', help='Search query')
+
+# name -> (help, argument builder)
+SUBCOMMANDS = {
+    'full': ('Full analysis and AI README synchronization', _add_standard_args),
+    'audit': ('Deep quality and security audit', _add_standard_args),
+    'docs': ('Generate/update documentation based on code', _add_standard_args),
+    'pr': ('Analyze changes and prepare PR description', _add_standard_args),
+    'commit': ('Generate a Conventional Commit message', _add_standard_args),
+    'branch': ('Create semantic branch', _add_branch_args),
+    'search-history': ('Search git history for variable/logic changes', _add_search_history_args),
+    'explain': ('AI-powered explanation of code blocks', _add_explain_args),
+    'where': ('Find code location using natural language', _add_where_args),
+}
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="GitMentor - Autonomous Code Steward",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -40,85 +138,77 @@ Examples:
     
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
 
-    # Helper to create consistent parsers for all modes
-    def add_standard_subcommand(name, help_text):
+    # Every command is listed, but only the one being invoked gets its arguments
+    if argv is None:
+        argv = sys.argv[1:]
+    invoked = next((a for a in argv if not a.startswith('-')), None)
+    for name, (help_text, configure) in SUBCOMMANDS.items():
         p = subparsers.add_parser(name, help=help_text)
-        p.add_argument('--intent', '-m', help='Context or intent for the AI agents')
-        p.add_argument("--target-branch", "--target", default="main", help="Base branch for comparison")
-        return p
-
-    # --- DEFINE COMMANDS ---
-    add_standard_subcommand('full', 'Full analysis and AI README synchronization')
-    add_standard_subcommand('audit', 'Deep quality and security audit')
-    add_standard_subcommand('docs', 'Generate/update documentation based on code')
-    add_standard_subcommand('pr', 'Analyze changes and prepare PR description')
-    add_standard_subcommand('commit', 'Generate a Conventional Commit message')
-
-    # --- BRANCH COMMAND ---
-    branch_parser = subparsers.add_parser('branch', help='Create semantic branch')
-    branch_parser.add_argument('--intent', '-m', required=True, help='Branch purpose/intent')
-    branch_parser.add_argument('--type', '-t', choices=[
-        'feat', 'fix', 'hotfix', 'refactor', 'perf', 
-        'docs', 'test', 'chore', 'style', 'ci', 'build'
-    ], help='Override branch type')
-    branch_parser.add_argument('--no-commit', action='store_true', help='Skip initial commit')
-
-    # --- SEARCH HISTORY COMMAND ---
-    search_parser = subparsers.add_parser('search-history', help='Search git history for variable/logic changes')
-    search_parser.add_argument('query', nargs='+', help='Query (e.g., "var_name in file.py")')
-
-    # --- EXPLAIN COMMAND ---
-    explain_parser = subparsers.add_parser('explain', help='AI-powered explanation of code blocks')
-    explain_parser.add_argument('name', help='Name of function or class')
-    explain_parser.add_argument('--level', '-l', choices=['beginner', 'medium', 'hard'], default='medium', help='Explanation complexity')
-    explain_parser.add_argument('--file', '-f', help='Specific file path')
-    explain_parser.add_argument('--type', '-t', choices=['function', 'class', 'auto'], default='auto')
-
-    # --- WHERE COMMAND ---
-    where_parser = subparsers.add_parser('where', help='Find code location using natural language')
-    where_parser.add_argument('query', nargs='+', help='Search query')
-
-    args = parser.parse_args()
+        if name == invoked:
+            configure(p)
+
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
         return
 
-    # Header
-    console.print(Panel(
-        f"[bold blue]{cfg.get('project.name', 'GITMENTOR').upper()}[/bold blue] | {args.command.upper()} ENGINE",
-        border_style="blue"
-    ))
-
     # --- EXECUTION ROUTING ---
-    
-    if args.command == 'branch':
-        _handle_branch_creation(args)
-        return
 
-    if args.command == 'search-history':
-        _execute_search_history(args)
+    if args.command in PIPELINE_MODES:
+        run(
+            mode=args.command,
+            target_branch=getattr(args, 'target_branch', 'main'),
+            intent=getattr(args, 'intent', None),
+            no_cache=getattr(args, 'no_cache', False)
+        )
         return
 
-    if args.command == 'explain':
-        _execute_explain(args)
-        return
+    _print_header(args.command)
+    COMMAND_HANDLERS[args.command](args)
 
-    if args.command == 'where':
-        _execute_where(args)
-        return
 
-    # Initialize Git for remaining commands
-    git_ops = GitOps(os.getcwd())
-    current_branch = git_ops.get_current_branch()
-    target_branch = getattr(args, 'target_branch', 'main')
-    user_intent = getattr(args, 'intent', None)
+def run(mode: str, target_branch: str = "main", intent=None, no_cache=False):
+    """
+    In-process entrypoint for the pipeline modes (full, audit, docs, pr, commit).
+    Used by both the argparse CLI above and cli.py, so neither has to re-exec Python.
+    """
+    _preload('scribe' if mode == "commit" else 'graph')
+    _ensure_env()
+    # Set on every run: the warm worker must not keep a previous request's --no-cache
+    from src.utils import llm_cache
+    llm_cache.configure(use_cache=not no_cache)
 
-    if args.command == "commit":
-        _execute_commit_mode(args)
+    if mode == "commit":
+        _print_header(mode)
+        _execute_commit_mode(intent)
         return
 
-    _execute_graph_mode(args, current_branch, target_branch, user_intent)
+    current_branch = _current_branch()
+    _print_header(
+        mode,
+        f"📍 Current Branch: {current_branch}",
+        f"🎯 Mode: {mode}",
+        f"🎯 Target: {target_branch}",
+    )
+    _execute_graph_mode(mode, current_branch, target_branch, intent)
+
+
+def _print_header(command: str, *details: str):
+    """Print the banner and any run details in a single console write."""
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.text import Text
+    from src.utils.config import cfg
+    console = _console()
+    banner = Panel(
+        f"[bold blue]{cfg.get('project.name', 'GITMENTOR').upper()}[/bold blue] | {command.upper()} ENGINE",
+        border_style="blue"
+    )
+    if details:
+        console.print(Group(banner, *(Text(line) for line in details)))
+    else:
+        console.print(banner)
 
 
 # ========================================================================
@@ -126,16 +216,18 @@ Examples:
 # ========================================================================
 
 def _execute_search_history(args):
-    from src.tools.history import HistoryAnalyzer
+    HistoryAnalyzer = _load('history')
+    from rich.table import Table
+    console = _console()
     query_text = ' '.join(args.query)
     parts = query_text.split(' in ')
     search_term = parts[0].strip()
     file_path = parts[1].strip() if len(parts) > 1 else None
     
-    git_ops = GitOps(os.getcwd())
+    git_ops = _git_ops()
     analyzer = HistoryAnalyzer(git_ops)
     
-    with console.status(f"[dim]Analyzing history for '{search_term}'..."):
+    with _status(f"[dim]Analyzing history for '{search_term}'..."):
         changes = analyzer.track_variable_changes(search_term, file_path, max_commits=100)
         current_value = analyzer.get_current_value(search_term, file_path) if file_path else None
 
@@ -160,10 +252,15 @@ def _execute_search_history(args):
     console.print(table)
 
 def _execute_explain(args):
-    from src.agents.explainer import CodeExplainer
+    _ensure_env()
+    CodeExplainer = _load('explainer')
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+    from rich.markdown import Markdown
+    console = _console()
     explainer = CodeExplainer(os.getcwd())
     
-    with console.status(f"[dim]Analyzing '{args.name}'..."):
+    with _status(f"[dim]Analyzing '{args.name}'..."):
         if args.type == 'auto':
             result = explainer.explain_function(args.name, args.level, args.file)
             if not result['success']:
@@ -182,12 +279,18 @@ def _execute_explain(args):
     console.print(Markdown(result['explanation']))
 
 def _execute_where(args):
-    from src.tools.history import HistoryAnalyzer
+    import json
+    import re
+    import textwrap
+    _ensure_env()
+    HistoryAnalyzer = _load('history')
     from src.utils.llm import get_llm
     from langchain_core.messages import SystemMessage, HumanMessage
+    from rich.table import Table
+    console = _console()
     
     query_text = ' '.join(args.query)
-    git_ops = GitOps(os.getcwd())
+    git_ops = _git_ops()
     analyzer = HistoryAnalyzer(git_ops)
     llm = get_llm("default")
     
@@ -201,7 +304,7 @@ def _execute_where(args):
     search_params = json.loads(json_match.group(0)) if json_match else {{"identifiers": [query_text]}}
     
     all_results = []
-    with console.status("[dim]Searching..."):
+    with _status("[dim]Searching..."):
         for iden in search_params.get('identifiers', []):
             all_results.extend(analyzer.find_function_definition(iden))
             all_results.extend(analyzer.find_class_definition(iden))
@@ -218,66 +321,253 @@ def _execute_where(args):
         table.add_row(res['file'], str(res['line_number']), res['matched_line'][:60])
     console.print(table)
 
-def _execute_graph_mode(args, current_branch, target_branch, user_intent):
-    initial_state = {
-        "repo_path": os.getcwd(), "target_branch": target_branch, "source_branch": current_branch,
-        "mode": args.command, "intent": user_intent, "artifacts": [], "messages": [], "code_issues": []
-    }
-    console.print(f"\n[bold]STARTING {args.command.upper()} PIPELINE[/bold]\n", style="dim")
-    
-    final_state = initial_state
-    with console.status(f"[dim]Processing {args.command} nodes...", spinner="dots"):
-        for event in app.stream(initial_state):
-            node_name = list(event.keys())[0]
-            final_state = event[node_name]
-            _render_node_summary(node_name, final_state)
+# Reducer-backed channels every run starts empty. Kept frozen and materialised
+# per run: RepoState appends to these with operator.add, which needs lists.
+_BASE_STATE = MappingProxyType({"artifacts": (), "messages": (), "code_issues": ()})
+
+def _new_state(**fields) -> dict:
+    state = {key: list(value) for key, value in _BASE_STATE.items()}
+    state.update(fields)
+    return state
+
+def _execute_graph_mode(mode, current_branch, target_branch, user_intent):
+    from concurrent.futures import ThreadPoolExecutor
+    app = _load('graph')
+    console = _console()
+    cwd = os.getcwd()
+    initial_state = _new_state(
+        repo_path=cwd, target_branch=target_branch, source_branch=current_branch,
+        mode=mode, intent=user_intent, git_ops=_git_ops(cwd)
+    )
+    console.print(f"\n[bold]STARTING {mode.upper()} PIPELINE[/bold]\n", style="dim")
     
-    if args.command == "full": _update_readme_with_analysis(final_state)
-    if args.command in ["pr", "full"]: _handle_pr_output(final_state, target_branch)
-    console.print(f"\n[bold green]{args.command.capitalize()} finished.[/bold green]")
-
-def _execute_commit_mode(args):
-    from src.agents.scribe import scribe_node
-    intent = getattr(args, 'intent', None) or Prompt.ask("Enter commit intent", default="General improvements")
-    state = {"repo_path": os.getcwd(), "mode": "commit", "intent": intent, "artifacts": [], "messages": [], "code_issues": []}
-    with console.status("[dim]Generating message..."):
-        result = scribe_node(state)
+    # "updates" streams only each node's delta; fold them into one running state
+    # instead of asking LangGraph for a full snapshot after every step.
+    # Private list copies so the merge can extend in place without touching
+    # the lists handed to LangGraph.
+    final_state = {k: list(v) if isinstance(v, list) else v for k, v in initial_state.items()}
+    # On a terminal node panels print above the spinner as each node finishes;
+    # for pipes/CI they are collected and written as one report at the end.
+    panels = []
+    emit = console.print if console.is_terminal else panels.append
+    finished = set()
+    readme_job = None
+    # Threads start only on submit; leaving the block waits for a README draft
+    # still in flight, so a failed run never leaves it running into the next one
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="readme") as readme_pool:
+        with _status(f"[dim]Processing {mode} nodes...", spinner="dots") as status:
+            for event in app.stream(initial_state, stream_mode="updates"):
+                # Usually one node per event, but parallel branches may land together
+                for node_name, update in event.items():
+                    if status is not None:
+                        status.update(f"[dim]{node_name.capitalize()} finished, continuing {mode} pipeline...")
+                    update = update or {}
+                    _merge_update(final_state, update)
+                    finished.add(node_name)
+                    # The README only reads Architect's and Steward's output, so its
+                    # LLM call can overlap the Tactician and Scribe instead of following them
+                    if mode == "full" and readme_job is None and {"architect", "steward"} <= finished:
+                        readme_job = _start_readme(readme_pool, final_state)
+                    # Render only this node's delta, and only when it produced output
+                    if update.get("artifacts") or update.get("code_issues"):
+                        panel = _render_node_summary(node_name, update)
+                        if panel is not None:
+                            emit(panel)
+        if panels:
+            from rich.console import Group
+            console.print(Group(*panels))
+        
+        if mode == "full": _update_readme_with_analysis(final_state, readme_job)
+    if mode in ["pr", "full"]: _handle_pr_output(final_state, target_branch, current_branch)
+    console.print(f"\n[bold green]{mode.capitalize()} finished.[/bold green]")
+
+def _merge_update(state: dict, update: dict):
+    """Apply a node's delta the way RepoState's reducers do: lists append, the rest overwrite."""
+    for key, value in update.items():
+        if isinstance(value, list) and isinstance(state.get(key), list):
+            state[key].extend(value)
+        else:
+            state[key] = value
+
+def _execute_commit_mode(intent=None):
+    scribe_node = _load('scribe')
+    cwd = os.getcwd()
+    git_ops = _git_ops(cwd)
+    # Cheap index check first: don't ask for an intent that would be thrown away
+    if not git_ops.has_staged_changes():
+        _print_no_staged()
+        return
+    if not intent:
+        if sys.stdin.isatty():
+            from rich.prompt import Prompt
+            intent = Prompt.ask("Enter commit intent", default="General improvements")
+        else:
+            # Never block on stdin in CI or under the warm worker
+            intent = "General improvements"
+    state = _new_state(repo_path=cwd, mode="commit", intent=intent, commit_intent=intent,
+                       git_ops=git_ops, has_staged_changes=True)
+    console = _console()
+    if not console.is_terminal:
+        with _status("[dim]Generating message..."):
+            result = scribe_node(state)
         _handle_commit_output(result)
+        return
+
+    # Show the message as the model writes it instead of behind a spinner
+    import time
+    from rich.live import Live
+    from rich.panel import Panel
+    from rich.text import Text
+    message = Text()
+    panel = Panel(message, title="Commit Message", subtitle="waiting for first token...", border_style="dim")
+    started = time.perf_counter()
+
+    def on_token(chunk: str):
+        if not message:
+            panel.subtitle = f"first token after {time.perf_counter() - started:.2f}s"
+        message.append(chunk)
+
+    state["on_token"] = on_token
+    with Live(panel, console=console, refresh_per_second=12, transient=True):
+        result = scribe_node(state)
+    if message:
+        console.print(panel)
+    _handle_commit_output(result)
+
+def _start_readme(pool, state):
+    """
+    Draft the README on pool from a snapshot of state; returns a Future.
+    The draft opens its own GitOps, so the run's shared handle (and its
+    memoised lookups) is never used from two threads.
+    """
+    from src.tools.gitops import GitOps
+    _generate_enhanced_readme = _load('readme')
+    snapshot = {k: list(v) if isinstance(v, list) else v for k, v in state.items()}
+    snapshot.pop("git_ops", None)
+    repo_path = state["repo_path"]
+    return pool.submit(lambda: _generate_enhanced_readme(GitOps(repo_path), snapshot))
+
+def _update_readme_with_analysis(state, pending=None):
+    console = _console()
+    if pending is not None:
+        new_content = pending.result()
+    else:
+        new_content = _load('readme')(_git_ops(), state)
+    if not new_content:
+        return
+    if _read_text("README.md") == new_content:
+        # No rewrite: keeps the mtime and git status clean, and the README-keyed LLM cache warm
+        console.print("    [dim]README.md already up to date.[/dim]")
+        return
+    _write_atomic("README.md", new_content)
+    console.print("    [green]README.md updated.[/green]")
 
-def _update_readme_with_analysis(state):
-    from src.agents.scribe import _generate_enhanced_readme
-    git_ops = GitOps(os.getcwd())
-    new_content = _generate_enhanced_readme(git_ops, state)
-    if new_content:
-        with open("README.md", "w") as f: f.write(new_content)
-        console.print("    [green]README.md updated.[/green]")
+def _read_text(path: str):
+    """Current contents of path, or None if it can't be read."""
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+def _write_atomic(path: str, content: str):
+    """Write beside the target, fsync, then swap it in so `path` is never half-written."""
+    import tempfile
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile("w", dir=directory, prefix=".tmp-", delete=False) as tmp:
+        try:
+            tmp.write(content)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+            # NamedTemporaryFile is 0600; keep the permissions README.md already had,
+            # or use what open(path, "w") would have created (0666 minus the umask)
+            if os.path.exists(path):
+                os.chmod(tmp.name, os.stat(path).st_mode & 0o7777)
+            else:
+                umask = os.umask(0)
+                os.umask(umask)
+                os.chmod(tmp.name, 0o666 & ~umask)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    try:
+        os.replace(tmp.name, path)
+    except BaseException:
+        os.unlink(tmp.name)
+        raise
 
 def _render_node_summary(node_name: str, state: dict):
+    """Build the panel for a node's output, or None if it produced nothing to show."""
+    from rich.console import Group
+    from rich.panel import Panel
+    from rich.text import Text
     artifacts = state.get("artifacts", [])
     issues = state.get("code_issues", [])
-    content = [f"Artifact: [bold]{a['description']}[/bold] -> [dim]{a['file_path']}[/dim]" for a in artifacts if a.get("created_by") == node_name]
+    # Styled Text pieces instead of markup strings: nothing to re-lex per node
+    content = [Text.assemble("Artifact: ", (a['description'], "bold"), " -> ", (a['file_path'], "dim")) for a in artifacts if a.get("created_by") == node_name]
     if node_name == "steward" and issues:
-        content.append("[bold red]Audit Findings:[/bold red]")
-        content.extend([f"  - {i['file']}: {i['message']}" for i in issues[:3]])
-    if content:
-        console.print(Panel("\n".join(content), title=f"Agent: {node_name.capitalize()}", border_style="dim"))
+        content.append(Text("Audit Findings:", style="bold red"))
+        content.extend([Text(f"  - {i['file']}: {i['message']}") for i in issues[:3]])
+    if not content:
+        return None
+    return Panel(Group(*content), title=f"Agent: {node_name.capitalize()}", border_style="dim")
 
 def _handle_branch_creation(args):
-    git_ops = GitOps(os.getcwd())
+    _ensure_env()
+    BranchManager = _load('branch_manager')
+    from rich.panel import Panel
+    from rich.text import Text
+    console = _console()
+    git_ops = _git_ops()
     manager = BranchManager(git_ops)
     try:
         name, btype = manager.create_smart_branch(user_intent=args.intent, auto_detect_type=(args.type is None), suggested_type=args.type, create_initial_commit=(not args.no_commit))
-        console.print(Panel(f"Branch: [cyan]{name}[/cyan]\nType: [yellow]{btype}[/yellow]", title="Success", border_style="green"))
+        console.print(Panel(Text.assemble("Branch: ", (name, "cyan"), "\nType: ", (btype, "yellow")), title="Success", border_style="green"))
     except Exception as e: console.print(f"[red]Error:[/red] {e}")
 
-def _handle_commit_output(state):
-    if any(a.get("type") == "commit_msg" for a in state.get("artifacts", [])):
-        console.print(Panel("Apply using: [bold]git commit -F COMMIT_MESSAGE.txt[/bold]", title="Success", border_style="green"))
+def _index_artifacts(state) -> dict:
+    """Map artifact type -> first artifact of that type, built once per lookup site."""
+    index = {}
+    for artifact in state.get("artifacts", []):
+        index.setdefault(artifact.get("type"), artifact)
+    return index
 
-def _handle_pr_output(state, target_branch):
-    git_ops = GitOps(os.getcwd())
-    current = git_ops.get_current_branch()
-    console.print(Panel(f"gh pr create --base {target_branch} --head {current} --body-file PR_Document.md", title="Deployment", border_style="green"))
+def _print_no_staged():
+    console = _console()
+    console.print("[red]❌ No staged changes found[/red]")
+    console.print("[yellow]Hint: Use 'git add <files>' to stage changes first[/yellow]")
+
+def _handle_commit_output(state):
+    from rich.panel import Panel
+    from rich.text import Text
+    console = _console()
+    by_type = _index_artifacts(state)
+    error = by_type.get("error")
+    if error and error.get("code") == "no_staged":
+        _print_no_staged()
+        return
+    commit_artifact = by_type.get("commit_msg")
+    if commit_artifact is None:
+        return
+    if commit_artifact.get("written"):
+        console.print(Panel(Text.assemble("Apply using: ", (f"git commit -F {commit_artifact['message_file']}", "bold")), title="Success", border_style="green"))
+    else:
+        console.print(Panel(Text.assemble("Apply using: ", (f"git commit -F {commit_artifact['file_path']}", "bold")), title="Saved to workspace", border_style="yellow"))
+
+def _handle_pr_output(state, target_branch, current_branch):
+    from rich.panel import Panel
+    from rich.text import Text
+    console = _console()
+    console.print(Panel(Text(f"gh pr create --base {target_branch} --head {current_branch} --body-file PR_Document.md"), title="Deployment", border_style="green"))
+
+# Non-pipeline commands -> handler (defined last, once every handler exists)
+COMMAND_HANDLERS = {
+    'branch': _handle_branch_creation,
+    'search-history': _execute_search_history,
+    'explain': _execute_explain,
+    'where': _execute_where,
+}
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,7 +5,7 @@ from rich.console import Console
 from langchain_core.messages import HumanMessage
 
 from src.state import RepoState
-from src.tools.parser import PythonCodeParser
+from src.tools.parser import PythonCodeParser, parse_cache_path
 from src.tools.diagram import MermaidGenerator
 from src.tools.gitops import GitOps
 from src.utils.workspace import save_artifact
@@ -22,21 +22,23 @@ def architect_node(state: RepoState) -> RepoState:
     console.print("[bold blue]--- Architect: Visualizing System ---[/bold blue]")
     
     # 1. Setup and Tool Initialization
-    repo_path = state.get("repo_path", cfg.get("paths.repo_root"))
+    repo_path = state.get("repo_path") or cfg.get("paths.repo_root")
+    # Own handle: in full mode this node runs alongside the Steward, which
+    # keeps the shared state["git_ops"] (GitPython handles aren't thread-safe)
     git_ops = GitOps(repo_path)
-    parser = PythonCodeParser(repo_path)
-    viz = MermaidGenerator(parser)
     
-    # Gather all tracked Python files to ensure the graph isn't empty
+    # Gather all tracked Python files to ensure the graph isn't empty.
+    # The same list drives the parser index and both diagrams.
     try:
         py_files = git_ops.repo.git.ls_files("*.py").splitlines()
     except Exception:
-        # Fallback to manual walk if git fails
-        py_files = []
-        for root, _, files in os.walk(repo_path):
-            for file in files:
-                if file.endswith(".py"):
-                    py_files.append(os.path.relpath(os.path.join(root, file), repo_path))
+        # Fallback: let the parser walk the tree (pruning ignored dirs) and reuse its index
+        py_files = None
+    
+    parser = PythonCodeParser(repo_path, files=py_files, cache_file=parse_cache_path(repo_path))
+    viz = MermaidGenerator(parser)
+    if py_files is None:
+        py_files = [os.path.relpath(p, parser.repo_root) for p in parser.module_map.values()]
 
     new_artifacts = []
     
@@ -58,7 +60,8 @@ def architect_node(state: RepoState) -> RepoState:
 
     # 3. Generate Complexity Heatmap (The "Quality Check")
     console.print("    Generating complexity heatmap...")
-    heatmap_code = viz.generate_complexity_heatmap()
+    heatmap_code = viz.generate_complexity_heatmap(py_files)
+    parser.save_cache()
     
     if heatmap_code:
         # Saves as .reporanger_workspace/complexity_heatmap.mmd (Overwrites)
@@ -1,8 +1,11 @@
 # src/agents/scribe.py - PROFESSIONAL VERSION WITH COMMIT TRACKING
 import os
 import json
-import textwrap
+import string
 import re
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from langchain_core.messages import SystemMessage, HumanMessage
@@ -11,6 +14,8 @@ from src.tools.gitops import GitOps
 from src.utils.llm import get_llm
 from src.utils.workspace import save_artifact
 from src.utils.config import cfg
+from src.utils import llm_cache
+from src.utils.diff_compress import compress_diff
 from rich.console import Console
 
 console = Console()
@@ -18,6 +23,278 @@ console = Console()
 # Constants
 COMMIT_DOCS_DIR = ".gitworkspace/commit_docs"
 COMMIT_INDEX_FILE = ".gitworkspace/commit_index.json"
+PENDING_COMMIT_DOCS_FILE = ".gitworkspace/pending_commit_docs.jsonl"
+# Queued docs for commits no PR run has seen within this many days are dropped
+PENDING_COMMIT_DOCS_MAX_AGE_DAYS = 30
+DEFAULT_COMMIT_INTENT = "General improvements"
+DOC_EXTENSIONS = (".md", ".rst")
+
+# Static instructions live in the system message, byte-identical across calls;
+# only the per-change context goes in the human message. Providers cache the
+# shared prefix, so repeated runs re-send (and re-bill) just the diff.
+COMMIT_SYSTEM_PROMPT = """\
+You write precise, conventional, production-quality commit messages.
+
+HARD RULES:
+1. Output ONLY the raw commit message text. No markdown, no code blocks.
+2. Follow Conventional Commits strictly: type(scope): subject
+3. Use one of these types only:
+feat, fix, refactor, perf, test, chore, docs, ci, build
+4. Subject line:
+- Imperative mood (e.g., "add", "fix", "remove", "refactor")
+- Max 72 characters
+- Describe the primary change, not the implementation
+5. Scope:
+- Single, concise noun derived from the affected area (e.g., api, auth, config)
+- Omit scope only if it cannot be inferred
+6. Body (optional but preferred if non-trivial):
+- Explain WHAT changed and WHY
+- Mention behavior changes, risk, or compatibility impact if relevant
+- Do NOT describe low-level implementation details
+7. If this change primarily addresses code quality issues, prefer 'fix' or 'refactor' as the type.
+
+QUALITY BAR:
+- The message should be suitable for changelogs and release notes.
+- Assume this commit will be read months later with no additional context.
+"""
+
+PR_SYSTEM_PROMPT = """\
+You are a Principal Software Engineer writing production documentation. 
+
+Output MUST be:
+- Pure markdown (NO code fence wrappers around the entire document)
+- Technically precise with concrete details from commit documentation
+- Comprehensive for production deployment decisions
+- Formatted perfectly for GitHub
+
+You NEVER:
+- Add preambles ("Here's the PR...")
+- Use vague qualifiers ("might", "various", "some")
+- Include emojis
+- Wrap entire response in code blocks
+
+Begin IMMEDIATELY with document content.
+
+CRITICAL OUTPUT REQUIREMENTS:
+1. Output PURE Markdown - NO surrounding code fences, NO conversational text
+2. Begin IMMEDIATELY with content (no preamble)
+3. Use precise technical language with concrete metrics and details
+4. Extract specific information from the detailed commit documentation provided
+5. Format for GitHub: proper headings, tables, code blocks, task lists
+6. Professional tone: no emojis, no casual language
+
+REQUIRED STRUCTURE:
+
+## Executive Summary
+- 2-3 sentences summarizing this PR
+- Key metrics from commits (performance gains, issues fixed, coverage)
+- Status: Ready for Review
+
+## 1. Problem Statement
+
+### Background
+Explain what problems existed before these changes
+
+### Current Pain Points
+List specific issues that were present (extract from commit docs)
+
+## 2. Solution Architecture
+
+### High-Level Approach
+Explain the overall strategy taken across all commits
+
+### Key Components Modified
+Detail the main components changed (extract from commit documentation):
+
+#### [Component Name 1]
+- Purpose and changes
+- Design decisions
+- Integration points
+
+Use Mermaid diagrams if helpful:
+```mermaid
+graph TD
+    A[Component] --> B[Component]
+```
+
+## 3. Detailed Technical Changes
+
+### 3.1 Commit-by-Commit Analysis
+
+For each major commit, provide a subsection:
+
+#### Commit: [Subject] (`hash`)
+- **What Changed**: Specific files and modifications
+- **Implementation**: How it works
+- **Impact**: Affected systems
+
+### 3.2 Configuration Changes
+Document environment variables, dependencies, or infrastructure changes
+
+## 4. Testing & Validation
+
+### 4.1 Automated Tests
+| Test Type | Coverage | Status |
+|-----------|----------|--------|
+| Unit | Details | ✓ Pass |
+| Integration | Details | ✓ Pass |
+
+### 4.2 Performance Benchmarks
+Extract actual numbers from commit documentation:
+```
+Before: [metric]
+After: [metric]
+Improvement: [percentage]
+```
+
+### 4.3 Manual Validation
+- [ ] Scenario tested
+- [ ] Edge cases verified
+
+## 5. Risk Assessment & Mitigation
+
+| Risk | Severity | Likelihood | Mitigation |
+|------|----------|------------|------------|
+| Specific risk | H/M/L | H/M/L | Strategy |
+
+### Rollback Plan
+```bash
+git revert <commit-range>
+# Additional steps
+```
+
+## 6. Performance Impact
+
+### Latency Changes
+[Specific measurements from commits]
+
+### Resource Utilization
+[CPU, memory, network impacts]
+
+### Cost Implications
+[If applicable]
+
+## 7. Deployment
+
+### Prerequisites
+- Database migrations
+- Feature flags
+- Config updates
+
+### Deployment Steps
+```bash
+# Step-by-step commands
+```
+
+### Verification
+```bash
+# Verification commands
+```
+
+## 8. Observability
+
+### New Metrics
+```
+metric_name{labels} - Description
+```
+
+### Logging Changes
+```json
+{"level": "INFO", "message": "Example"}
+```
+
+## 9. Future Work
+
+### Short-term (Next Sprint)
+- [ ] Item 1
+- [ ] Item 2
+
+### Medium-term (Next Quarter)
+- Future improvements
+
+## 10. Approval Checklist
+
+- [ ] Code review (2+ approvers)
+- [ ] Tests passing
+- [ ] Performance validated
+- [ ] Security reviewed
+- [ ] Documentation updated
+
+## 11. Contributors
+
+**Authors:** [The authors listed in the repository context]
+
+---
+
+QUALITY RULES:
+1. Be specific: Use exact numbers, file names, function names from commit docs
+2. Show evidence: Include test results, benchmarks, metrics
+3. Explain tradeoffs: Why this approach vs alternatives
+4. Think scale: Concurrent load, data growth, geographic distribution
+5. Risk first: Be upfront about limitations
+6. Actionable: Recommendations should be ticketable
+7. Professional: Write for staff engineers and architects
+8. Scannable: Use tables, lists, code blocks effectively
+
+Remember: Extract and synthesize information from the detailed commit documentation.
+Don't just summarize commits - provide architectural insights and technical analysis.
+"""
+
+
+# Fence tags a model uses when it wraps a whole markdown response
+_MD_FENCE_TAGS = ('', 'markdown', 'md')
+
+# Response clean-up patterns, compiled once
+_HEADER_RE = re.compile(r'^#+\s', re.MULTILINE)
+_PREAMBLE_RES = tuple(re.compile(p, re.IGNORECASE | re.MULTILINE) for p in (
+    r'^(?:Here\'?s|Here is|I\'?ve created|I\'?ve generated|Below is).*?(?:\n|:)\s*',
+    r'^(?:Let me|I will|I can).*?(?:\n|:)\s*',
+    r'^.*?(?:Pull Request|PR documentation).*?(?:\n|:)\s*',
+))
+
+
+def _strip_fences(text: str, any_language: bool = False, trailing_space: bool = False) -> str:
+    """
+    Drop a code fence the model wrapped around the whole response.
+    
+    Only a markdown fence (```, ```markdown, ```md) is opened up unless
+    any_language is set; trailing_space also accepts whitespace after the
+    closing fence. Both ends are plain prefix/suffix checks.
+    """
+    if text.startswith('```'):
+        tag, newline, body = text[3:].partition('\n')
+        is_word = not tag or tag.replace('_', 'a').isalnum()
+        if newline and (tag in _MD_FENCE_TAGS or (any_language and is_word)):
+            text = body
+    if trailing_space:
+        if text.rstrip().endswith('\n```'):
+            text = text.rstrip()[:-4]
+    elif text.endswith('\n```'):
+        text = text[:-4]
+    elif text.endswith('\n```\n'):
+        text = text[:-5] + '\n'
+    return text
+
+
+def _system_message(text: str) -> SystemMessage:
+    """System message for a static prompt, marked cacheable where the provider needs it."""
+    if cfg.get("llm.provider") == "anthropic":
+        # Anthropic only caches prefixes that carry an explicit breakpoint
+        return SystemMessage(content=[
+            {"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}
+        ])
+    return SystemMessage(content=text)
+
+
+def _llm_cache_key(kind: str, *parts) -> str:
+    """Cache key for one generator; the model is part of it so switching models misses."""
+    model = cfg.get("llm.creative.model", cfg.get("llm.default.model"))
+    return llm_cache.cache_key(kind, cfg.get("llm.provider"), model, *parts)
+
+@lru_cache(maxsize=1)
+def _get_creative_llm():
+    """The "creative" client, built once per process and shared by every generator."""
+    return get_llm("creative")
 
 def scribe_node(state: RepoState) -> RepoState:
     """
@@ -28,11 +305,11 @@ def scribe_node(state: RepoState) -> RepoState:
     """
     console.print("[bold blue]--- Scribe: Drafting Documentation ---[/bold blue]")
     
-    repo_path = state.get("repo_path", cfg.get("paths.repo_root"))
+    repo_path = state.get("repo_path") or cfg.get("paths.repo_root")
     target_branch = state.get("target_branch", "main")
     mode = state.get("mode", "pr")
     
-    git_ops = GitOps(repo_path)
+    git_ops = state.get("git_ops") or GitOps(repo_path)
     artifacts = []
     
     # Ensure commit docs directory exists
@@ -42,7 +319,7 @@ def scribe_node(state: RepoState) -> RepoState:
         artifacts = _generate_commit_message(git_ops, state)
     elif mode == "docs":
         artifacts = _generate_system_documentation(git_ops, state)
-    elif mode == "pr":
+    elif mode in ("pr", "full"):
         artifacts = _generate_pr_documentation(git_ops, state, target_branch)
     else:
         console.print(f"[red]Error:[/red] Unknown mode '{mode}'.")
@@ -73,7 +350,139 @@ def _ensure_commit_docs_dir(repo_path: str):
             json.dump({"commits": []}, f)
 
 
-def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: dict) -> str:
+# Shared by the single and batched commit-doc prompts
+_COMMIT_DOC_REQUIREMENTS = """\
+REQUIREMENTS:
+Generate a detailed technical document that explains:
+1. **What Changed**: Specific modifications made (files, functions, classes)
+2. **Why It Changed**: Business or technical rationale
+3. **How It Works**: Brief explanation of the implementation approach
+4. **Impact**: What systems/modules are affected
+5. **Technical Debt**: Any known limitations or follow-up needed
+"""
+
+_COMMIT_DOC_OUTLINE = """\
+## Changes Overview
+[High-level summary in 2-3 sentences]
+
+## Technical Details
+
+### Modified Components
+[List specific files/modules and what changed in each]
+
+### Implementation Approach
+[Explain how the solution works]
+
+### Code Quality Improvements
+[If applicable, list issues resolved]
+
+## Impact Analysis
+
+### Affected Systems
+[Which parts of the codebase are impacted]
+
+### Breaking Changes
+[If any, list them clearly]
+
+### Performance Implications
+[Any performance changes, positive or negative]
+
+## Technical Debt & Follow-ups
+[Any known limitations or future improvements needed]
+"""
+
+_COMMIT_DOC_CONTEXT = """\
+Hash: $hash
+Author: $author
+Date: $date
+Message: $subject
+
+Files Changed:
+$files_changed
+
+Diff Preview:
+$diff_preview
+
+Code Quality Issues Addressed:
+$issues_fixed
+"""
+
+# Prompt templates are dedented once at import; substitute() never rescans the inserted diff/docs
+_COMMIT_DOC_PROMPT = string.Template("""\
+You are a Senior Software Engineer documenting a code commit for future PR generation.
+
+COMMIT CONTEXT:
+""" + _COMMIT_DOC_CONTEXT + """
+""" + _COMMIT_DOC_REQUIREMENTS + """
+OUTPUT FORMAT (Pure Markdown, NO code fences):
+
+# Commit: $title
+
+**Hash:** `$commit_hash`  
+**Author:** $author  
+**Date:** $date
+
+""" + _COMMIT_DOC_OUTLINE + """
+CRITICAL: Output ONLY the markdown content. NO preambles, NO code fences wrapping the entire response.
+""")
+
+# Commits documented per model call when the PR run drains the queue
+COMMIT_DOC_BATCH_SIZE = 8
+
+_COMMIT_DOC_BATCH_ITEM = string.Template("===COMMIT $index===\n" + _COMMIT_DOC_CONTEXT)
+
+_COMMIT_DOC_BATCH_PROMPT = string.Template("""\
+You are a Senior Software Engineer documenting $count code commits for future PR generation.
+
+COMMITS:
+$commits
+""" + _COMMIT_DOC_REQUIREMENTS + """
+Write one such document for EACH commit above, in the same order.
+
+OUTPUT FORMAT (Pure Markdown, NO code fences):
+Start every document with its delimiter line `===DOC <n>===`, where <n> is the
+number of the matching `===COMMIT <n>===` block, followed by:
+
+# Commit: <commit message>
+
+**Hash:** `<hash>`  
+**Author:** <author>  
+**Date:** <date>
+
+""" + _COMMIT_DOC_OUTLINE + """
+CRITICAL: Output ONLY the delimiter lines and the markdown documents. NO preambles, NO code fences.
+""")
+
+_DOC_DELIMITER_RE = re.compile(r'^===DOC (\d+)===[ \t]*$', re.MULTILINE)
+
+
+def _write_commit_doc(commit_hash: str, commit_data: dict) -> str:
+    """Generate the markdown document for one commit with the LLM."""
+    llm = _get_creative_llm()
+    
+    prompt = _COMMIT_DOC_PROMPT.substitute(
+        hash=commit_data.get('hash', commit_hash),
+        author=commit_data.get('author', 'Unknown'),
+        date=commit_data.get('date', 'Unknown'),
+        subject=commit_data.get('subject', 'No message'),
+        files_changed=commit_data.get('files_changed', 'No files listed'),
+        diff_preview=commit_data.get('diff_preview', 'No diff available'),
+        issues_fixed=commit_data.get('issues_fixed', 'None reported'),
+        title=commit_data.get('subject', 'Commit Documentation'),
+        commit_hash=commit_hash
+    )
+    
+    response = llm.invoke([
+        SystemMessage(content="You are a technical documentation expert. Output pure markdown only."),
+        HumanMessage(content=prompt)
+    ])
+    
+    # Clean the response
+    return _strip_fences(response.content.strip())
+
+
+def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: dict,
+                               content: str = None) -> str:
     """
     Save detailed commit documentation to .gitworkspace/commit_docs/
     
@@ -81,6 +490,7 @@ def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: di
         repo_path: Repository root path
         commit_hash: Short commit hash (7 chars)
         commit_data: Dictionary containing commit details
+        content: Already generated document; generated here if omitted
     
     Returns:
         Path to saved markdown file
@@ -90,83 +500,7 @@ def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: di
     filename = f"{timestamp}_{commit_hash}.md"
     filepath = docs_dir / filename
     
-    # Generate detailed commit documentation
-    llm = get_llm("creative")
-    
-    prompt = textwrap.dedent(f"""
-    You are a Senior Software Engineer documenting a code commit for future PR generation.
-    
-    COMMIT CONTEXT:
-    Hash: {commit_data.get('hash', commit_hash)}
-    Author: {commit_data.get('author', 'Unknown')}
-    Date: {commit_data.get('date', 'Unknown')}
-    Message: {commit_data.get('subject', 'No message')}
-    
-    Files Changed:
-    {commit_data.get('files_changed', 'No files listed')}
-    
-    Diff Preview:
-    {commit_data.get('diff_preview', 'No diff available')}
-    
-    Code Quality Issues Addressed:
-    {commit_data.get('issues_fixed', 'None reported')}
-    
-    REQUIREMENTS:
-    Generate a detailed technical document that explains:
-    1. **What Changed**: Specific modifications made (files, functions, classes)
-    2. **Why It Changed**: Business or technical rationale
-    3. **How It Works**: Brief explanation of the implementation approach
-    4. **Impact**: What systems/modules are affected
-    5. **Technical Debt**: Any known limitations or follow-up needed
-    
-    OUTPUT FORMAT (Pure Markdown, NO code fences):
-    
-    # Commit: {commit_data.get('subject', 'Commit Documentation')}
-    
-    **Hash:** `{commit_hash}`  
-    **Author:** {commit_data.get('author', 'Unknown')}  
-    **Date:** {commit_data.get('date', 'Unknown')}
-    
-    ## Changes Overview
-    [High-level summary in 2-3 sentences]
-    
-    ## Technical Details
-    
-    ### Modified Components
-    [List specific files/modules and what changed in each]
-    
-    ### Implementation Approach
-    [Explain how the solution works]
-    
-    ### Code Quality Improvements
-    [If applicable, list issues resolved]
-    
-    ## Impact Analysis
-    
-    ### Affected Systems
-    [Which parts of the codebase are impacted]
-    
-    ### Breaking Changes
-    [If any, list them clearly]
-    
-    ### Performance Implications
-    [Any performance changes, positive or negative]
-    
-    ## Technical Debt & Follow-ups
-    [Any known limitations or future improvements needed]
-    
-    CRITICAL: Output ONLY the markdown content. NO preambles, NO code fences wrapping the entire response.
-    """)
-    
-    response = llm.invoke([
-        SystemMessage(content="You are a technical documentation expert. Output pure markdown only."),
-        HumanMessage(content=prompt)
-    ])
-    
-    # Clean the response
-    clean_content = response.content.strip()
-    clean_content = re.sub(r'^```(?:markdown|md)?\n', '', clean_content)
-    clean_content = re.sub(r'\n```$', '', clean_content)
+    clean_content = content if content is not None else _write_commit_doc(commit_hash, commit_data)
     
     # Save to file
     with open(filepath, 'w') as f:
@@ -192,6 +526,148 @@ def _save_commit_documentation(repo_path: str, commit_hash: str, commit_data: di
     return str(filepath)
 
 
+def _write_commit_docs_batch(commit_items: list) -> list:
+    """
+    Generate the documents for up to COMMIT_DOC_BATCH_SIZE commits with one
+    LLM call. Blocks the model leaves out (or misnumbers) are regenerated
+    one commit at a time, so every item gets a document.
+    
+    Args:
+        commit_items: (commit_hash, commit_data) pairs
+    
+    Returns:
+        One markdown document per item, in order
+    """
+    blocks = [
+        _COMMIT_DOC_BATCH_ITEM.substitute(
+            index=i,
+            hash=commit_hash,
+            author=data.get('author', 'Unknown'),
+            date=data.get('date', 'Unknown'),
+            subject=data.get('subject', 'No message'),
+            files_changed=data.get('files_changed', 'No files listed'),
+            diff_preview=data.get('diff_preview', 'No diff available'),
+            issues_fixed=data.get('issues_fixed', 'None reported')
+        )
+        for i, (commit_hash, data) in enumerate(commit_items, 1)
+    ]
+    prompt = _COMMIT_DOC_BATCH_PROMPT.substitute(count=len(commit_items), commits="\n".join(blocks))
+    
+    response = _get_creative_llm().invoke([
+        SystemMessage(content="You are a technical documentation expert. Output pure markdown only."),
+        HumanMessage(content=prompt)
+    ])
+    
+    # re.split with a group yields [preamble, n1, doc1, n2, doc2, ...]
+    parts = _DOC_DELIMITER_RE.split(response.content)
+    docs = {}
+    for number, body in zip(parts[1::2], parts[2::2]):
+        body = _strip_fences(body.strip()).strip()
+        if body:
+            docs.setdefault(int(number), body)
+    
+    return [
+        docs.get(i) or _write_commit_doc(commit_hash, data)
+        for i, (commit_hash, data) in enumerate(commit_items, 1)
+    ]
+
+
+def _save_commit_documentation_batch(repo_path: str, commit_items: list) -> list:
+    """
+    Document several commits with one LLM call per COMMIT_DOC_BATCH_SIZE
+    commits and save each result like _save_commit_documentation().
+    
+    Every document is generated before any is written, so a failed call
+    leaves nothing half-saved.
+    
+    Args:
+        repo_path: Repository root path
+        commit_items: (commit_hash, commit_data) pairs
+    
+    Returns:
+        Paths to the saved markdown files, in order
+    """
+    contents = []
+    for start in range(0, len(commit_items), COMMIT_DOC_BATCH_SIZE):
+        contents.extend(_write_commit_docs_batch(commit_items[start:start + COMMIT_DOC_BATCH_SIZE]))
+    
+    return [
+        _save_commit_documentation(repo_path, commit_hash, data, content)
+        for (commit_hash, data), content in zip(commit_items, contents)
+    ]
+
+
+def _queue_commit_documentation(repo_path: str, commit_data: dict) -> str:
+    """
+    Record commit_data for the next PR run instead of documenting it now.
+    
+    Returns:
+        Path to the pending queue file
+    """
+    queue_file = Path(repo_path) / PENDING_COMMIT_DOCS_FILE
+    with open(queue_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(dict(commit_data, queued=time.time())) + "\n")
+    console.print("    [green]✓[/green] Queued commit documentation for PR generation")
+    return str(queue_file)
+
+
+def _document_pending_commits(repo_path: str, commits_data: list) -> int:
+    """
+    Write the documents queued by commit mode for commits that landed on
+    this branch, and remove those entries from the queue.
+    
+    Queued entries are matched to commits by the tree that was staged when
+    the message was generated, so an edited or amended message still
+    matches and two commits with the same subject stay apart. The commit's
+    real hash, subject, author and date replace the queued ones; the last
+    entry queued for a commit wins.
+    
+    Unmatched entries (other branches, changes not committed yet) stay
+    queued for a later PR run until they are older than
+    PENDING_COMMIT_DOCS_MAX_AGE_DAYS.
+    
+    Returns:
+        Number of commits documented
+    """
+    queue_file = Path(repo_path) / PENDING_COMMIT_DOCS_FILE
+    try:
+        lines = queue_file.read_text(encoding='utf-8').splitlines()
+    except OSError:
+        return 0
+    
+    cutoff = time.time() - PENDING_COMMIT_DOCS_MAX_AGE_DAYS * 86400
+    by_tree = {c['tree']: c for c in commits_data}
+    pending = {}
+    remaining = []
+    for line in lines:
+        try:
+            data = json.loads(line)
+        except ValueError:
+            continue
+        commit = by_tree.get(data.get('tree'))
+        if commit:
+            pending[commit['hash']] = dict(
+                data, hash=commit['hash'], subject=commit['subject'],
+                author=commit['author'], date=commit['date']
+            )
+        elif data.get('tree') and data.get('queued', 0) >= cutoff:
+            remaining.append(line)
+    
+    if pending:
+        console.print(f"    Documenting {len(pending)} queued commit(s)...")
+        try:
+            _save_commit_documentation_batch(repo_path, list(pending.items()))
+        except Exception as e:
+            console.print(f"    [yellow]Warning:[/yellow] Could not document queued commits: {e}")
+            return 0  # Keep the queue for the next run
+    
+    if remaining:
+        queue_file.write_text("\n".join(remaining) + "\n", encoding='utf-8')
+    else:
+        queue_file.unlink(missing_ok=True)
+    return len(pending)
+
+
 def _load_all_commit_docs(repo_path: str, commits_to_include: list = None) -> str:
     """
     Load all commit documentation from .gitworkspace/commit_docs/
@@ -215,25 +691,28 @@ def _load_all_commit_docs(repo_path: str, commits_to_include: list = None) -> st
     
     # Filter by commit hashes if provided
     if commits_to_include:
-        commits = [c for c in commits if c['hash'] in commits_to_include]
+        wanted = set(commits_to_include)
+        commits = [c for c in commits if c['hash'] in wanted]
     
     if not commits:
         return ""
     
     console.print(f"    [cyan]Loading {len(commits)} commit documentation(s)...[/cyan]")
     
-    combined_content = "# Detailed Commit History\n\n"
-    combined_content += f"This PR includes {len(commits)} commit(s) with the following detailed changes:\n\n"
-    combined_content += "---\n\n"
+    parts = [
+        "# Detailed Commit History\n\n",
+        f"This PR includes {len(commits)} commit(s) with the following detailed changes:\n\n",
+        "---\n\n",
+    ]
     
     for commit in commits:
-        filepath = Path(repo_path) / commit['filepath']
-        if filepath.exists():
-            with open(filepath, 'r') as f:
-                content = f.read()
-                combined_content += content + "\n\n---\n\n"
+        try:
+            parts.append((Path(repo_path) / commit['filepath']).read_text())
+        except OSError:
+            continue  # Doc removed by hand; the index entry is stale
+        parts.append("\n\n---\n\n")
     
-    return combined_content
+    return "".join(parts)
 
 
 def _cleanup_commit_docs(repo_path: str):
@@ -246,7 +725,17 @@ def _cleanup_commit_docs(repo_path: str):
     
     if docs_dir.exists():
         import shutil
-        shutil.rmtree(docs_dir)
+        import tempfile
+        # Move the whole directory aside in one rename, so an interrupted
+        # cleanup never leaves a half-deleted set of docs for the next PR.
+        # A fresh holder per run: a leftover from an earlier run can't block the rename.
+        try:
+            holder = tempfile.mkdtemp(prefix=docs_dir.name + ".trash-", dir=docs_dir.parent)
+            os.replace(docs_dir, os.path.join(holder, docs_dir.name))
+        except OSError:
+            shutil.rmtree(docs_dir, ignore_errors=True)
+        for leftover in docs_dir.parent.glob(docs_dir.name + ".trash*"):
+            shutil.rmtree(leftover, ignore_errors=True)
         console.print("    [yellow]Cleaned up commit documentation files[/yellow]")
     
     if index_file.exists():
@@ -265,11 +754,11 @@ def _generate_system_documentation(git_ops: GitOps, state: RepoState) -> list:
     """Generates comprehensive technical documentation for the entire codebase."""
     console.print("    [yellow]Mode: System Documentation Generation[/yellow]")
     
-    from src.tools.parser import PythonCodeParser
+    from src.tools.parser import PythonCodeParser, parse_cache_path
     from src.tools.diagram import MermaidGenerator
     
     repo_path = state.get("repo_path", os.getcwd())
-    parser = PythonCodeParser(repo_path)
+    parser = PythonCodeParser(repo_path, cache_file=parse_cache_path(repo_path))
     architect = MermaidGenerator(parser)
     
     py_files = git_ops.repo.git.ls_files("*.py").splitlines()
@@ -277,43 +766,35 @@ def _generate_system_documentation(git_ops: GitOps, state: RepoState) -> list:
     
     dep_graph = architect.generate_architecture_map(py_files)
     complexity_map = architect.generate_complexity_heatmap()
+    parser.save_cache()
     
-    detailed_context = ""
+    context_parts = []
+    # generate_architecture_map() has already parsed these; only parse what it skipped
+    analyses = parser.file_analyses
     for file_path in py_files[:15]: 
         try:
-            analysis = parser.analyze_file(file_path)
+            analysis = analyses.get(file_path) or parser.analyze_file(file_path)
             if analysis.classes or analysis.functions:
-                detailed_context += f"\n### File: {file_path}\n"
-                for cls in analysis.classes:
-                    methods_list = ", ".join([m for m in cls.methods])
-                    detailed_context += f"- Class: {cls.name} (Methods: {methods_list})\n"
-                for func in analysis.functions:
-                    detailed_context += f"- Function: {func.name}\n"
+                context_parts.append(f"\n### File: {file_path}\n")
+                context_parts.extend(
+                    f"- Class: {cls.name} (Methods: {', '.join(cls.methods)})\n"
+                    for cls in analysis.classes
+                )
+                context_parts.extend(f"- Function: {func.name}\n" for func in analysis.functions)
         except Exception:
             continue
+    detailed_context = "".join(context_parts)
 
-    llm = get_llm("creative")
-    prompt = textwrap.dedent(f"""
-        You are a Principal Software Architect. Your goal is to write a "System Blueprint" document.
-        
-        Analyze the following technical context:
-        {detailed_context}
-        
-        Requirements:
-        1. Executive Summary: Explain the "Why" behind this system.
-        2. Component Analysis: Describe the interaction between high-level modules.
-        3. Implementation Detail: Summarize the logic found in key files.
-        4. Operational Flow: How does data move through this system?
-        
-        Tone: Highly technical, objective, and authoritative.
-    """)
-    
-    response = llm.invoke([
-        SystemMessage(content="You are a Technical Lead writing high-level system documentation."),
-        HumanMessage(content=prompt)
-    ])
+    # The module summary is the only model input, so it alone decides the blueprint
+    key = _llm_cache_key("docs", detailed_context)
+    blueprint = llm_cache.load(key)
+    if blueprint is not None:
+        console.print("    [dim]Reusing cached system overview for these modules[/dim]")
+    else:
+        blueprint = _generate_blueprint_with_llm(detailed_context)
+        llm_cache.store(key, blueprint)
     
-    full_docs = f"# System Documentation\n\n{response.content}\n\n"
+    full_docs = f"# System Documentation\n\n{blueprint}\n\n"
     
     if dep_graph:
         full_docs += f"## System Architecture Map\n```mermaid\n{dep_graph}\n```\n\n"
@@ -324,10 +805,9 @@ def _generate_system_documentation(git_ops: GitOps, state: RepoState) -> list:
     doc_path = save_artifact(full_docs, "md", prefix="documentation")
     
     try:
-        with open("CODE_DOCS.md", "w") as f:
-            f.write(full_docs)
+        Path("CODE_DOCS.md").write_text(full_docs, encoding="utf-8")
         console.print("    [green]Success:[/green] Saved to CODE_DOCS.md")
-    except Exception as e:
+    except OSError as e:
         console.print(f"    [red]Warning:[/red] Could not save to root: {e}")
     
     return [{
@@ -339,6 +819,35 @@ def _generate_system_documentation(git_ops: GitOps, state: RepoState) -> list:
     }]
 
 
+_BLUEPRINT_PROMPT = string.Template("""\
+You are a Principal Software Architect. Your goal is to write a "System Blueprint" document.
+
+Analyze the following technical context:
+$detailed_context
+
+Requirements:
+1. Executive Summary: Explain the "Why" behind this system.
+2. Component Analysis: Describe the interaction between high-level modules.
+3. Implementation Detail: Summarize the logic found in key files.
+4. Operational Flow: How does data move through this system?
+
+Tone: Highly technical, objective, and authoritative.
+""")
+
+
+def _generate_blueprint_with_llm(detailed_context: str) -> str:
+    """Ask the model for the System Blueprint prose from the module summary."""
+    llm = _get_creative_llm()
+    prompt = _BLUEPRINT_PROMPT.substitute(
+        detailed_context=detailed_context
+    )
+    
+    return llm.invoke([
+        SystemMessage(content="You are a Technical Lead writing high-level system documentation."),
+        HumanMessage(content=prompt)
+    ]).content
+
+
 # ============================================================================
 # COMMIT MESSAGE GENERATION
 # ============================================================================
@@ -349,44 +858,63 @@ def _generate_commit_message(git_ops: GitOps, state: RepoState) -> list:
     
     repo_path = state.get("repo_path", os.getcwd())
     
-    if not git_ops.has_staged_changes():
-        console.print("    [red]Error:[/red] No staged changes found. Use 'git add <files>' first.")
-        return []
+    # Commit mode's CLI checks the index before prompting; don't spawn git for it twice
+    has_staged = state.get("has_staged_changes")
+    if has_staged is None:
+        has_staged = git_ops.has_staged_changes()
+    if not has_staged:
+        return [{
+            "id": "commit_message",
+            "type": "error",
+            "code": "no_staged",
+            "description": "No staged changes found",
+            "created_by": "scribe"
+        }]
     
-    diff = git_ops.get_staged_diff()
+    diff, staged_files = git_ops.get_staged_diff_with_files()
     if not diff:
         return []
+    console.print(f"    Analyzing {len(staged_files)} staged file(s)")
     
-    try:
-        staged_files = git_ops.repo.git.diff("--cached", name_only=True).split('\n')
-        staged_files = [f.strip() for f in staged_files if f.strip()]
-        console.print(f"    Analyzing {len(staged_files)} staged file(s)")
-    except Exception:
-        staged_files = []
-    
-    user_intent = state.get("commit_intent", "General improvements")
+    user_intent = state.get("commit_intent", DEFAULT_COMMIT_INTENT)
     code_issues = state.get("code_issues", [])
-    
-    console.print("    Generating commit message with AI...")
+    on_token = state.get("on_token")
+    
+    commit_msg = ""
+    if user_intent == DEFAULT_COMMIT_INTENT and not code_issues:
+        commit_msg = _rule_based_commit_message(git_ops, staged_files)
+    if commit_msg:
+        console.print("    Trivial change detected, skipping AI generation")
+        if on_token:
+            on_token(commit_msg)
+    else:
+        console.print("    Generating commit message with AI...")
     
     try:
-        commit_msg = _generate_commit_with_llm(
-            diff=diff,
-            files=staged_files,
-            user_intent=user_intent,
-            code_issues=code_issues
-        )
+        if not commit_msg:
+            commit_msg = _generate_commit_with_llm(
+                diff=diff,
+                files=staged_files,
+                user_intent=user_intent,
+                code_issues=code_issues,
+                on_token=on_token
+            )
         
         commit_path = save_artifact(commit_msg, "txt", prefix="commit_message")
-        with open("COMMIT_MESSAGE.txt", "w") as f:
-            f.write(commit_msg)
-        console.print("    [green]Success:[/green] Saved to COMMIT_MESSAGE.txt")
+        message_file = os.path.abspath("COMMIT_MESSAGE.txt")
+        try:
+            Path(message_file).write_text(commit_msg, encoding="utf-8")
+            written = True
+            console.print("    [green]Success:[/green] Saved to COMMIT_MESSAGE.txt")
+        except OSError as e:
+            written = False
+            console.print(f"    [yellow]Warning:[/yellow] Could not write COMMIT_MESSAGE.txt: {e}")
         
         # Generate a temporary commit hash for documentation (will be replaced after actual commit)
         temp_hash = datetime.now().strftime("%Y%m%d%H%M%S")[:7]
         
         # Prepare detailed commit data for documentation
-        diff_preview = diff[:2000] + "\n... [truncated]" if len(diff) > 2000 else diff
+        diff_preview = compress_diff(diff, 2000)
         
         issues_fixed = ""
         if code_issues:
@@ -405,7 +933,14 @@ def _generate_commit_message(git_ops: GitOps, state: RepoState) -> list:
         }
         
         # Save detailed commit documentation
-        doc_path = _save_commit_documentation(repo_path, temp_hash, commit_data)
+        defer_docs = cfg.get("scribe.defer_commit_docs", True)
+        if defer_docs:
+            # Written by the next PR run, once the commit exists and has its real hash.
+            # The staged tree identifies the commit even if its message is edited.
+            commit_data["tree"] = git_ops.get_staged_tree()
+            doc_path = _queue_commit_documentation(repo_path, commit_data)
+        else:
+            doc_path = _save_commit_documentation(repo_path, temp_hash, commit_data)
         
         console.print("    [cyan]💡 Tip:[/cyan] After committing, the system will track this commit for PR generation")
         
@@ -413,13 +948,15 @@ def _generate_commit_message(git_ops: GitOps, state: RepoState) -> list:
             "id": "commit_message",
             "type": "commit_msg",
             "file_path": commit_path,
+            "message_file": message_file,
+            "written": written,
             "description": "Generated commit message",
             "created_by": "scribe"
         }, {
             "id": "commit_documentation",
             "type": "commit_doc",
             "file_path": doc_path,
-            "description": "Detailed commit documentation",
+            "description": "Queued commit documentation" if defer_docs else "Detailed commit documentation",
             "created_by": "scribe"
         }]
     except Exception as e:
@@ -427,10 +964,45 @@ def _generate_commit_message(git_ops: GitOps, state: RepoState) -> list:
         return []
 
 
-def _generate_commit_with_llm(diff: str, files: list, user_intent: str, code_issues: list) -> str:
-    llm = get_llm("creative")
+def _rule_based_commit_message(git_ops: GitOps, files: list) -> str:
+    """
+    Template a message for staged changes too trivial to need the LLM:
+    documentation-only or whitespace-only. Returns "" if no rule applies.
+    """
+    if not files:
+        return ""
+    target = files[0] if len(files) == 1 else f"{len(files)} files"
+    if all(f.lower().endswith(DOC_EXTENSIONS) for f in files):
+        return f"docs: update {target}"
+    if git_ops.staged_changes_are_whitespace_only():
+        return f"style: fix whitespace in {target}"
+    return ""
+
+
+_COMMIT_PROMPT = string.Template("""\
+Write the Conventional Commit message for this change.
+
+AVAILABLE CONTEXT:
+Developer Intent (may be incomplete or informal):
+$user_intent
+
+Changed Files (use to infer scope, not to list verbatim):
+$files
+
+$issues_context
+
+Diff Summary (may be truncated):
+$diff_snippet
+""")
 
-    diff_snippet = diff[:3000] + "\n... [truncated]" if len(diff) > 3000 else diff
+
+def _generate_commit_with_llm(diff: str, files: list, user_intent: str, code_issues: list,
+                              on_token=None) -> str:
+    """
+    Draft the Conventional Commit message. When on_token is given the
+    response is streamed and each text chunk is passed to it as it arrives.
+    """
+    diff_snippet = compress_diff(diff, 3000)
 
     issues_context = ""
     if code_issues:
@@ -442,56 +1014,45 @@ def _generate_commit_with_llm(diff: str, files: list, user_intent: str, code_iss
             f"- Warnings addressed: {warnings}\n"
         )
 
-    prompt = textwrap.dedent(f"""
-    You are a senior software engineer writing a high-quality Conventional Commit message.
-
-    AVAILABLE CONTEXT:
-    Developer Intent (may be incomplete or informal):
-    {user_intent}
-
-    Changed Files (use to infer scope, not to list verbatim):
-    {', '.join(files[:10])}
-
-    {issues_context}
-
-    Diff Summary (may be truncated):
-    {diff_snippet}
-
-    HARD RULES:
-    1. Output ONLY the raw commit message text. No markdown, no code blocks.
-    2. Follow Conventional Commits strictly: type(scope): subject
-    3. Use one of these types only:
-    feat, fix, refactor, perf, test, chore, docs, ci, build
-    4. Subject line:
-    - Imperative mood (e.g., "add", "fix", "remove", "refactor")
-    - Max 72 characters
-    - Describe the primary change, not the implementation
-    5. Scope:
-    - Single, concise noun derived from the affected area (e.g., api, auth, config)
-    - Omit scope only if it cannot be inferred
-    6. Body (optional but preferred if non-trivial):
-    - Explain WHAT changed and WHY
-    - Mention behavior changes, risk, or compatibility impact if relevant
-    - Do NOT describe low-level implementation details
-    7. If this change primarily addresses code quality issues, prefer 'fix' or 'refactor' as the type.
-
-    QUALITY BAR:
-    - The message should be suitable for changelogs and release notes.
-    - Assume this commit will be read months later with no additional context.
-    """)
+    # Same staged diff + intent as a previous run -> reuse that message
+    key = _llm_cache_key("commit", diff, user_intent, ",".join(files[:10]), issues_context)
+    cached = llm_cache.load(key)
+    if cached is not None:
+        console.print("    [dim]Reusing cached commit message for this diff[/dim]")
+        if on_token:
+            on_token(cached)
+        return cached
+
+    llm = _get_creative_llm()
+    prompt = _COMMIT_PROMPT.substitute(
+        user_intent=user_intent,
+        files=', '.join(files[:10]),
+        issues_context=issues_context,
+        diff_snippet=diff_snippet
+    )
 
-    response = llm.invoke([
-        SystemMessage(content="You write precise, conventional, production-quality commit messages."),
+    messages = [
+        _system_message(COMMIT_SYSTEM_PROMPT),
         HumanMessage(content=prompt)
-    ])
+    ]
+    if on_token is None:
+        msg = llm.invoke(messages).content
+    else:
+        parts = []
+        for chunk in llm.stream(messages):
+            if chunk.content:
+                on_token(chunk.content)
+                parts.append(chunk.content)
+        msg = "".join(parts)
 
-    msg = response.content.strip()
+    msg = msg.strip()
 
     # Safety cleanup in case the model still emits fences
-    msg = re.sub(r'^```[\w]*\n', '', msg)
-    msg = re.sub(r'\n```$', '', msg)
+    msg = _strip_fences(msg, any_language=True)
 
-    return msg.strip()
+    msg = msg.strip()
+    llm_cache.store(key, msg)
+    return msg
 
 
 # ============================================================================
@@ -503,31 +1064,44 @@ def _generate_pr_documentation(git_ops: GitOps, state: RepoState, target_branch:
     
     repo_path = state.get("repo_path", os.getcwd())
     
-    commits, actual_target = _get_commits_since(git_ops, target_branch)
-    if not commits:
+    # Build the model client while git does its work below
+    llm_future = _prepare_llm()
+    
+    commits_data, _ = _get_commits_since(git_ops, target_branch)
+    if not commits_data:
         console.print("    [red]Warning:[/red] No commits found to document.")
         return []
     
-    commits_data = [_get_commit_details(git_ops, c) for c in commits]
     source_branch = git_ops.get_current_branch()
     
     # Load all detailed commit documentation
     commit_hashes = [c['hash'] for c in commits_data]
     detailed_commits_content = _load_all_commit_docs(repo_path, commit_hashes)
     
+    def refresh_commit_docs():
+        # Queued docs cost model calls, so they are only written on a PR cache miss
+        if not _document_pending_commits(repo_path, commits_data):
+            return None
+        return _load_all_commit_docs(repo_path, commit_hashes)
+    
     pr_text = _generate_pr_with_llm(
         commits_data=commits_data,
         source_branch=source_branch,
         target_branch=target_branch,
         code_issues=state.get("code_issues", []),
         artifacts=state.get("artifacts", []),
-        detailed_commit_docs=detailed_commits_content
+        detailed_commit_docs=detailed_commits_content,
+        intent=state.get("intent"),
+        refresh_commit_docs=refresh_commit_docs,
+        llm_future=llm_future
     )
     
     pr_path = save_artifact(pr_text, "md", prefix="pr_documentation")
-    with open("PR_Document.md", "w") as f:
-        f.write(pr_text)
-    console.print("    [green]Success:[/green] Saved to PR_Document.md")
+    try:
+        Path("PR_Document.md").write_text(pr_text, encoding="utf-8")
+        console.print("    [green]Success:[/green] Saved to PR_Document.md")
+    except OSError as e:
+        console.print(f"    [red]Warning:[/red] Could not write PR_Document.md: {e}")
     
     # Clean up commit docs after PR generation
     console.print("    [yellow]Cleaning up commit documentation...[/yellow]")
@@ -537,21 +1111,78 @@ def _generate_pr_documentation(git_ops: GitOps, state: RepoState, target_branch:
         "id": "pr_document",
         "type": "markdown_doc",
         "file_path": pr_path,
-        "description": f"PR Documentation ({len(commits)} commits)",
+        "description": f"PR Documentation ({len(commits_data)} commits)",
         "created_by": "scribe"
     }]
 
 
+def _prepare_llm() -> Future:
+    """
+    Start building the creative LLM client on a worker thread. Client setup
+    (SDK, credentials, HTTP session) overlaps with the caller's git work;
+    .result() returns the client or re-raises get_llm()'s error.
+    """
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-setup")
+    try:
+        return executor.submit(_get_creative_llm)
+    finally:
+        executor.shutdown(wait=False)
+
+
+# One record per commit: NUL-terminated (-z), fields split by the unit separator
+_COMMIT_LOG_FORMAT = "format:%H%x1f%T%x1f%an%x1f%ad%x1f%s"
+_COMMIT_FIELDS = ("hash", "tree", "author", "date", "subject")
+
+
 def _get_commits_since(git_ops: GitOps, base_branch: str):
+    """
+    Commits on HEAD that are not on base_branch, with the metadata the PR
+    prompt uses, read with a single `git log` instead of per-commit calls.
+    Commits whose change already landed on base_branch are left out.
+    """
+    max_commits = cfg.get("scribe.pr.max_commits", 50)
     try:
         target = base_branch if _branch_exists(git_ops, base_branch) else f"origin/{base_branch}"
-        commits = git_ops.repo.git.log(f"{target}..HEAD", pretty="format:%H").splitlines()
-        return commits, target
+        # --cherry-pick --right-only drops branch commits whose patch is already on
+        # target (cherry-picked or rebased copies). One extra record tells whether
+        # the cap was hit without a separate count.
+        log = git_ops.repo.git.log(
+            f"{target}...HEAD", "--cherry-pick", "--right-only", "-z",
+            pretty=_COMMIT_LOG_FORMAT, date="format:%Y-%m-%d %H:%M", max_count=max_commits + 1
+        )
     except Exception:
         return [], base_branch
 
+    commits = []
+    for record in log.split("\0"):
+        fields = record.split("\x1f")
+        if len(fields) != len(_COMMIT_FIELDS):
+            continue
+        commit = dict(zip(_COMMIT_FIELDS, fields))
+        commit["hash"] = commit["hash"][:7]
+        commits.append(commit)
+
+    if len(commits) > max_commits:
+        try:
+            total = git_ops.repo.git.rev_list("--count", "--cherry-pick", "--right-only", f"{target}...HEAD")
+        except Exception:
+            total = f"more than {max_commits}"
+        console.print(
+            f"    [yellow]Warning:[/yellow] {total} commits since {target}; "
+            f"documenting the latest {max_commits} (scribe.pr.max_commits)"
+        )
+        commits = commits[:max_commits]
+    return commits, target
+
 
 def _branch_exists(git_ops: GitOps, branch: str) -> bool:
+    # GitPython resolves refs and simple revisions in-process; only fork git
+    # for what it can't answer (missing refs, exotic revision syntax)
+    try:
+        git_ops.repo.rev_parse(branch)
+        return True
+    except Exception:
+        pass
     try:
         git_ops.repo.git.rev_parse("--verify", branch)
         return True
@@ -559,20 +1190,30 @@ def _branch_exists(git_ops: GitOps, branch: str) -> bool:
         return False
 
 
-def _get_commit_details(git_ops: GitOps, commit_hash: str) -> dict:
-    repo = git_ops.repo
-    commit = repo.commit(commit_hash)
-    stats = repo.git.show("--stat", commit_hash, "--oneline")
-    preview = repo.git.show(commit_hash, color="never").split('\n')[5:20]
-    
-    return {
-        "hash": commit.hexsha[:7],
-        "author": commit.author.name,
-        "date": commit.authored_datetime.strftime("%Y-%m-%d %H:%M"),
-        "subject": commit.message.split('\n')[0],
-        "stats": stats,
-        "preview": '\n'.join(preview)
-    }
+_README_PROMPT = string.Template("""\
+You are a Principal Developer Advocate. Your task is to transform the project README.md 
+into a world-class documentation hub based on the latest architectural analysis.
+
+EXISTING README:
+$current_readme
+
+CURRENT ARCHITECTURE CONTEXT:
+$arch_context
+
+RECENT CODE QUALITY STATE:
+$code_issues
+
+REQUIREMENTS:
+1. Executive Summary: Retain or improve the core mission statement.
+2. System Vision: Embed insights from the provided architecture context.
+3. Feature Set: Update the list based on the actual modules detected.
+4. Quality Standard: Summarize the current health of the project.
+5. DO NOT wrap the entire response in markdown code blocks.
+6. Return raw markdown content only.
+
+Tone: Professional, inviting, and technically accurate.
+""")
+
 
 def _generate_enhanced_readme(git_ops: GitOps, state: RepoState) -> str:
     """Uses LLM to rewrite the README based on codebase reality and architecture."""
@@ -584,39 +1225,35 @@ def _generate_enhanced_readme(git_ops: GitOps, state: RepoState) -> str:
             current_readme = f.read()
             
     # Gather architectural context from previous nodes
-    arch_context = ""
+    arch_parts = []
     for art in state.get("artifacts", []):
         if "architecture_overview" in art.get("id", "") or "architecture" in art.get("file_path", ""):
             try:
                 with open(art["file_path"], "r") as f:
-                    arch_context += f"\n{f.read()}"
+                    arch_parts.append(f"\n{f.read()}")
             except Exception:
                 continue
+    arch_context = "".join(arch_parts)
 
-    llm = get_llm("creative")
-    prompt = textwrap.dedent(f"""
-        You are a Principal Developer Advocate. Your task is to transform the project README.md 
-        into a world-class documentation hub based on the latest architectural analysis.
-        
-        EXISTING README:
-        {current_readme}
-        
-        CURRENT ARCHITECTURE CONTEXT:
-        {arch_context}
-        
-        RECENT CODE QUALITY STATE:
-        {state.get('code_issues', [])}
-        
-        REQUIREMENTS:
-        1. Executive Summary: Retain or improve the core mission statement.
-        2. System Vision: Embed insights from the provided architecture context.
-        3. Feature Set: Update the list based on the actual modules detected.
-        4. Quality Standard: Summarize the current health of the project.
-        5. DO NOT wrap the entire response in markdown code blocks.
-        6. Return raw markdown content only.
-        
-        Tone: Professional, inviting, and technically accurate.
-    """)
+    code_issues = state.get('code_issues', [])
+
+    # Keyed on every tracked (path, blob sha1) plus unstaged edits and every prompt input
+    try:
+        tree_state = git_ops.repo.git.ls_files("-s") + git_ops.repo.git.diff("--no-color")
+        cache_key = _llm_cache_key("readme", tree_state, current_readme, arch_context, code_issues)
+    except Exception:
+        cache_key = None
+    cached = llm_cache.load(cache_key) if cache_key else None
+    if cached is not None:
+        console.print("    [dim]Reusing cached README for this tree[/dim]")
+        return cached
+
+    llm = _get_creative_llm()
+    prompt = _README_PROMPT.substitute(
+        current_readme=current_readme,
+        arch_context=arch_context,
+        code_issues=code_issues
+    )
     
     response = llm.invoke([
         SystemMessage(content="You are an expert technical documentarian. Output pure markdown only."),
@@ -624,19 +1261,51 @@ def _generate_enhanced_readme(git_ops: GitOps, state: RepoState) -> str:
     ])
     
     # Cleaning Logic
-    clean_content = response.content.strip()
-    clean_content = re.sub(r'^```(?:markdown|md)?\n', '', clean_content)
-    clean_content = re.sub(r'\n```$', '', clean_content)
+    clean_content = _strip_fences(response.content.strip())
     
+    if cache_key:
+        llm_cache.store(cache_key, clean_content)
     return clean_content
-    
-def _generate_pr_with_llm(commits_data, source_branch, target_branch, code_issues, artifacts, detailed_commit_docs=""):
+
+
+_PR_PROMPT = string.Template("""\
+Write the Pull Request documentation for this change.
+
+REPOSITORY CONTEXT:
+Branch Path: $source_branch → $target_branch
+Authors: $authors
+
+Commits Summary:
+$commits_text
+$intent_section$files_context
+$issues_section
+$commit_docs_section
+""")
+
+
+def _pr_commit_docs_section(detailed_commit_docs: str) -> str:
+    if not detailed_commit_docs:
+        return ""
+    return f"""
+
+DETAILED COMMIT DOCUMENTATION:
+{detailed_commit_docs}
+
+Use the above detailed commit documentation to understand the full context of each change.
+Extract specific technical details, metrics, and implementation approaches from these docs.
+"""
+
+
+def _generate_pr_with_llm(commits_data, source_branch, target_branch, code_issues, artifacts, detailed_commit_docs="",
+                          intent=None, refresh_commit_docs=None, llm_future=None):
     """
     Generate comprehensive, production-ready Pull Request documentation.
     Now includes detailed commit documentation from saved files.
+    The LLM body is reused from the cache when the same prompt was sent before.
+    On a miss, refresh_commit_docs (if given) may write pending commit docs and
+    return the reloaded docs, or None if nothing changed.
+    llm_future, if given, is a client already being built by _prepare_llm().
     """
-    llm = get_llm("creative")
-    
     # Build commits summary
     commits_text = "\n".join([
         f"- `{c['hash']}`: {c['subject']} ({c['author']})" 
@@ -665,240 +1334,41 @@ This PR addresses {critical} critical, {high} high, and {medium} medium severity
         if file_changes:
             files_context = f"\nFiles Modified: {len(file_changes)} files"
 
-    # Include detailed commit documentation
-    commit_docs_section = ""
-    if detailed_commit_docs:
-        commit_docs_section = f"""
-
-DETAILED COMMIT DOCUMENTATION:
-{detailed_commit_docs}
-
-Use the above detailed commit documentation to understand the full context of each change.
-Extract specific technical details, metrics, and implementation approaches from these docs.
-"""
-
-    prompt = textwrap.dedent(f"""
-    You are a Principal Software Engineer writing production-grade Pull Request documentation.
-
-    REPOSITORY CONTEXT:
-    Branch Path: {source_branch} → {target_branch}
-    
-    Commits Summary:
-    {commits_text}
-    {files_context}
-    {issues_section}
-    {commit_docs_section}
-
-    CRITICAL OUTPUT REQUIREMENTS:
-    1. Output PURE Markdown - NO surrounding code fences, NO conversational text
-    2. Begin IMMEDIATELY with content (no preamble)
-    3. Use precise technical language with concrete metrics and details
-    4. Extract specific information from the detailed commit documentation above
-    5. Format for GitHub: proper headings, tables, code blocks, task lists
-    6. Professional tone: no emojis, no casual language
-
-    REQUIRED STRUCTURE:
-
-    ## Executive Summary
-    - 2-3 sentences summarizing this PR
-    - Key metrics from commits (performance gains, issues fixed, coverage)
-    - Status: Ready for Review
-
-    ## 1. Problem Statement
-    
-    ### Background
-    Explain what problems existed before these changes
-    
-    ### Current Pain Points
-    List specific issues that were present (extract from commit docs)
-
-    ## 2. Solution Architecture
-
-    ### High-Level Approach
-    Explain the overall strategy taken across all commits
-
-    ### Key Components Modified
-    Detail the main components changed (extract from commit documentation):
-    
-    #### [Component Name 1]
-    - Purpose and changes
-    - Design decisions
-    - Integration points
-    
-    Use Mermaid diagrams if helpful:
-    ```mermaid
-    graph TD
-        A[Component] --> B[Component]
-    ```
-
-    ## 3. Detailed Technical Changes
-
-    ### 3.1 Commit-by-Commit Analysis
-    
-    For each major commit, provide a subsection:
-    
-    #### Commit: [Subject] (`hash`)
-    - **What Changed**: Specific files and modifications
-    - **Implementation**: How it works
-    - **Impact**: Affected systems
-    
-    ### 3.2 Configuration Changes
-    Document environment variables, dependencies, or infrastructure changes
-
-    ## 4. Testing & Validation
-
-    ### 4.1 Automated Tests
-    | Test Type | Coverage | Status |
-    |-----------|----------|--------|
-    | Unit | Details | ✓ Pass |
-    | Integration | Details | ✓ Pass |
-
-    ### 4.2 Performance Benchmarks
-    Extract actual numbers from commit documentation:
-    ```
-    Before: [metric]
-    After: [metric]
-    Improvement: [percentage]
-    ```
-
-    ### 4.3 Manual Validation
-    - [ ] Scenario tested
-    - [ ] Edge cases verified
-
-    ## 5. Risk Assessment & Mitigation
-
-    | Risk | Severity | Likelihood | Mitigation |
-    |------|----------|------------|------------|
-    | Specific risk | H/M/L | H/M/L | Strategy |
-
-    ### Rollback Plan
-    ```bash
-    git revert <commit-range>
-    # Additional steps
-    ```
-
-    ## 6. Performance Impact
-
-    ### Latency Changes
-    [Specific measurements from commits]
-
-    ### Resource Utilization
-    [CPU, memory, network impacts]
-
-    ### Cost Implications
-    [If applicable]
-
-    ## 7. Deployment
-
-    ### Prerequisites
-    - Database migrations
-    - Feature flags
-    - Config updates
-
-    ### Deployment Steps
-    ```bash
-    # Step-by-step commands
-    ```
-
-    ### Verification
-    ```bash
-    # Verification commands
-    ```
-
-    ## 8. Observability
-
-    ### New Metrics
-    ```
-    metric_name{{labels}} - Description
-    ```
-
-    ### Logging Changes
-    ```json
-    {{"level": "INFO", "message": "Example"}}
-    ```
-
-    ## 9. Future Work
-
-    ### Short-term (Next Sprint)
-    - [ ] Item 1
-    - [ ] Item 2
-
-    ### Medium-term (Next Quarter)
-    - Future improvements
-
-    ## 10. Approval Checklist
-
-    - [ ] Code review (2+ approvers)
-    - [ ] Tests passing
-    - [ ] Performance validated
-    - [ ] Security reviewed
-    - [ ] Documentation updated
-
-    ## 11. Contributors
-
-    **Authors:** {', '.join(set([c['author'] for c in commits_data]))}
+    intent_section = f"\nAuthor's Intent: {intent}\n" if intent else ""
 
-    ---
-
-    QUALITY RULES:
-    1. Be specific: Use exact numbers, file names, function names from commit docs
-    2. Show evidence: Include test results, benchmarks, metrics
-    3. Explain tradeoffs: Why this approach vs alternatives
-    4. Think scale: Concurrent load, data growth, geographic distribution
-    5. Risk first: Be upfront about limitations
-    6. Actionable: Recommendations should be ticketable
-    7. Professional: Write for staff engineers and architects
-    8. Scannable: Use tables, lists, code blocks effectively
-    
-    Remember: Extract and synthesize information from the detailed commit documentation.
-    Don't just summarize commits - provide architectural insights and technical analysis.
-    """)
-
-    system_message = SystemMessage(content="""You are a Principal Software Engineer writing production documentation. 
-
-Output MUST be:
-- Pure markdown (NO code fence wrappers around the entire document)
-- Technically precise with concrete details from commit documentation
-- Comprehensive for production deployment decisions
-- Formatted perfectly for GitHub
-
-You NEVER:
-- Add preambles ("Here's the PR...")
-- Use vague qualifiers ("might", "various", "some")
-- Include emojis
-- Wrap entire response in code blocks
-
-Begin IMMEDIATELY with document content.""")
+    authors = ', '.join(sorted({c['author'] for c in commits_data}))
+    prompt_fields = dict(
+        source_branch=source_branch,
+        target_branch=target_branch,
+        authors=authors,
+        commits_text=commits_text,
+        intent_section=intent_section,
+        files_context=files_context,
+        issues_section=issues_section
+    )
+    prompt = _PR_PROMPT.substitute(
+        prompt_fields, commit_docs_section=_pr_commit_docs_section(detailed_commit_docs)
+    )
 
-    response = llm.invoke([
-        system_message,
-        HumanMessage(content=prompt)
-    ])
-    
-    # Advanced content cleaning
-    clean_content = response.content.strip()
-    
-    # Remove conversational preambles
-    preamble_patterns = [
-        r'^(?:Here\'?s|Here is|I\'?ve created|I\'?ve generated|Below is).*?(?:\n|:)\s*',
-        r'^(?:Let me|I will|I can).*?(?:\n|:)\s*',
-        r'^.*?(?:Pull Request|PR documentation).*?(?:\n|:)\s*'
-    ]
-    for pattern in preamble_patterns:
-        clean_content = re.sub(pattern, '', clean_content, flags=re.IGNORECASE | re.MULTILINE)
-    
-    # Remove markdown code fences
-    if clean_content.startswith('```'):
-        clean_content = re.sub(r'^```(?:markdown|md)?\n', '', clean_content)
-        clean_content = re.sub(r'\n```\s*$', '', clean_content)
-    
-    # Ensure we start with a header
-    if not clean_content.startswith('#'):
-        header_match = re.search(r'^#+\s', clean_content, re.MULTILINE)
-        if header_match:
-            clean_content = clean_content[header_match.start():]
-    
-    clean_content = clean_content.strip()
+    # The rendered prompt carries every input (commits, intent, issues, commit docs)
+    cache_key = _llm_cache_key("pr", prompt)
+    cached = llm_cache.load(cache_key)
+    if cached is not None:
+        console.print("    [dim]Reusing cached PR body for these commits and docs[/dim]")
+        clean_content = cached
+    else:
+        refreshed_docs = refresh_commit_docs() if refresh_commit_docs else None
+        if refreshed_docs is not None:
+            prompt = _PR_PROMPT.substitute(
+                prompt_fields, commit_docs_section=_pr_commit_docs_section(refreshed_docs)
+            )
+            cache_key = _llm_cache_key("pr", prompt)
+        llm = llm_future.result() if llm_future else _get_creative_llm()
+        clean_content = _clean_pr_body(llm.invoke([
+            _system_message(PR_SYSTEM_PROMPT),
+            HumanMessage(content=prompt)
+        ]).content)
+        llm_cache.store(cache_key, clean_content)
     
     # Build document header
     now = datetime.now().strftime("%Y-%m-%d %H:%M")
@@ -935,4 +1405,25 @@ Begin IMMEDIATELY with document content.""")
         )
         return header + commits_section + clean_content
     
-    return header + clean_content
\ No newline at end of file
+    return header + clean_content
+
+
+def _clean_pr_body(raw: str) -> str:
+    """Strip preambles and wrapping fences the model adds around the PR body."""
+    clean_content = raw.strip()
+    
+    # Remove conversational preambles
+    for pattern in _PREAMBLE_RES:
+        clean_content = pattern.sub('', clean_content)
+    
+    # Remove markdown code fences
+    if clean_content.startswith('```'):
+        clean_content = _strip_fences(clean_content, trailing_space=True)
+    
+    # Ensure we start with a header
+    if not clean_content.startswith('#'):
+        header_match = _HEADER_RE.search(clean_content)
+        if header_match:
+            clean_content = clean_content[header_match.start():]
+    
+    return clean_content.strip()
@@ -6,7 +6,7 @@ from langchain_core.messages import HumanMessage
 
 from src.state import RepoState
 from src.tools.gitops import GitOps
-from src.tools.parser import PythonCodeParser, ImportType
+from src.tools.parser import PythonCodeParser, ImportType, parse_cache_path
 from src.utils.workspace import save_artifact
 from src.utils.config import cfg
 
@@ -27,11 +27,11 @@ def steward_node(state: RepoState) -> RepoState:
     """
     print("--- 🛡️  Steward: Analyzing Code Quality ---")
     
-    repo_path = state.get("repo_path", cfg.get("paths.repo_root"))
+    repo_path = state.get("repo_path") or cfg.get("paths.repo_root")
     target_branch = state.get("target_branch", "main")
 
-    git_ops = GitOps(repo_path)
-    parser = PythonCodeParser(repo_path)
+    git_ops = state.get("git_ops") or GitOps(repo_path)
+    parser = PythonCodeParser(repo_path, cache_file=parse_cache_path(repo_path))
 
     # Get changed Python files
     changed_files = _get_changed_python_files(git_ops, target_branch)
@@ -178,6 +178,7 @@ def steward_node(state: RepoState) -> RepoState:
                 })
     except:
         pass
+    parser.save_cache()
 
     # Generate Report
     report_content = _generate_report(issues_found, file_metrics, changed_files)
@@ -19,8 +19,8 @@ def tactician_node(state: RepoState) -> RepoState:
     - Provides structured next steps and command suggestions
     - Uses Rich for professional console formatting
     """
-    repo_path = state.get("repo_path", cfg.get("paths.repo_root"))
-    git_ops = GitOps(repo_path)
+    repo_path = state.get("repo_path") or cfg.get("paths.repo_root")
+    git_ops = state.get("git_ops") or GitOps(repo_path)
     
     artifacts = state.get("artifacts", [])
     code_issues = state.get("code_issues", [])
@@ -32,7 +32,8 @@ def route_start(state: RepoState) -> str:
     elif mode == "pr":
         return "steward"
     else:  # "full"
-        return "architect"
+        # Architect and Steward don't read each other's output: run them side by side
+        return ["architect", "steward"]
 
 def route_steward(state: RepoState) -> str:
     """Determine next node after Steward analysis"""
@@ -66,8 +67,8 @@ workflow.add_conditional_edges(
     }
 )
 
-# Standard flow: Architect -> Steward
-workflow.add_edge("architect", "steward")
+# Full flow: Architect runs alongside Steward and joins at the Tactician
+workflow.add_edge("architect", "tactician")
 
 # Steward conditional routing
 workflow.add_conditional_edges(
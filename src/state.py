@@ -6,7 +6,7 @@ Tiny Context: The LLM prompt looks like this:
 Persistance: If the script crashes, your artifacts are safe on disk (file_path), not lost in Python memory.
 Modularity: The "Visual Architect" writes to a file. The "Scribe" reads that file later to include it in the README. They don't need to pass the string to each other.
 """
-from typing import Annotated, List, TypedDict, Union, Dict, Any
+from typing import Annotated, List, TypedDict, Union, Dict, Any, Optional
 import operator
 from langchain_core.messages import BaseMessage
 
@@ -25,10 +25,13 @@ class Artifact(TypedDict):
 class RepoState(TypedDict):
     messages: Annotated[List[BaseMessage], operator.add]
     repo_path: str
+    mode: str  # Pipeline mode (full, audit, docs, pr); drives the graph's routing
+    intent: Optional[str]  # User's --intent, passed through to the Scribe's prompts
     target_branch: str
     source_branch: str  # ADD THIS - current branch being merged
     artifacts: Annotated[List[Artifact], operator.add]
     next_node: str
     errors: Annotated[List[str], operator.add]
     code_issues: Annotated[List[str], operator.add]  # ADD THIS - for Steward output
-    pr_metadata: Dict[str, Any]  # ADD THIS - commit counts, authors, etc.
\ No newline at end of file
+    pr_metadata: Dict[str, Any]  # ADD THIS - commit counts, authors, etc.
+    git_ops: Any  # Shared GitOps instance so agents don't reopen the repo
\ No newline at end of file
@@ -131,16 +131,21 @@ class MermaidGenerator:
 
         return "\n".join(mermaid)
 
-    def generate_complexity_heatmap(self) -> str:
+    def generate_complexity_heatmap(self, files: List[str] = None) -> str:
         """
         Uses the parser's metrics to create a visual heatmap.
         Files with high complexity are colored RED.
        
         """
-        files = list(self.parser.file_analyses.keys())
-        if not files:
-            self.parser.get_dependency_graph()
+        if files is not None:
+            # Reuses analyses already produced by generate_architecture_map
+            self.parser.get_dependency_graph(files)
+            files = [f for f in files if f in self.parser.file_analyses]
+        else:
             files = list(self.parser.file_analyses.keys())
+            if not files:
+                self.parser.get_dependency_graph()
+                files = list(self.parser.file_analyses.keys())
 
         mermaid = [
             "%% RepoRanger Complexity Heatmap",
@@ -158,9 +163,9 @@ class MermaidGenerator:
             "    end",
         ]
 
+        index = self.parser.index
         for f in sorted(files):
-            analysis = self.parser.file_analyses[f]
-            score = analysis.metrics.cyclomatic_complexity
+            score = index[f][1]
 
             if score < 10:
                 style = "safe"
@@ -1,7 +1,15 @@
 import os
-from typing import List, Optional
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import List, Optional, Tuple
 from git import Repo, GitCommandError, InvalidGitRepositoryError, NoSuchPathError
 
+# Resolve the git binary once so direct subprocess calls skip the $PATH walk
+_GIT = shutil.which("git") or "git"
+# Upper bound for direct git invocations so a wedged git (locks, AV scans) can't hang the CLI
+GIT_TIMEOUT = 30
+
 
 class GitOps:
     """
@@ -17,6 +25,8 @@ class GitOps:
         Initialize with the path to the local repository.
         """
         self.repo_path = repo_path
+        self._native_repo = None
+        self._current_branch = None  # Memoised HEAD name; reset on branch switches
 
         try:
             self.repo = Repo(repo_path)
@@ -35,6 +45,19 @@ class GitOps:
         """
         return self.repo.head.is_valid()
 
+    def _get_native_repo(self):
+        """
+        Returns a cached pygit2 handle for in-process index reads,
+        or None when pygit2 is not installed.
+        """
+        if self._native_repo is None:
+            try:
+                import pygit2
+                self._native_repo = pygit2.Repository(self.repo.git_dir)
+            except Exception:
+                self._native_repo = False
+        return self._native_repo or None
+
     # ------------------------------------------------------------------
     # Branch Operations
     # ------------------------------------------------------------------
@@ -43,7 +66,14 @@ class GitOps:
         """
         Safely retrieves the current branch name, 
         handling detached HEAD states common in CI environments.
+
+        The result is cached on the instance and invalidated by switch_branch().
         """
+        if self._current_branch is None:
+            self._current_branch = self._resolve_current_branch()
+        return self._current_branch
+
+    def _resolve_current_branch(self) -> str:
         try:
             # Standard approach for local dev
             return self.repo.active_branch.name
@@ -64,6 +94,7 @@ class GitOps:
         Branch creation and switching are not allowed if the repo
         has no commits yet.
         """
+        self._current_branch = None
         try:
             if not self.has_commits():
                 return (
@@ -99,10 +130,10 @@ class GitOps:
         """
         try:
             if target_branch:
-                return self.repo.git.diff(target_branch)
+                return self.repo.git.diff("--no-color", target_branch)
             if self.has_commits():
-                return self.repo.git.diff("HEAD")
-            return self.repo.git.diff()
+                return self.repo.git.diff("--no-color", "HEAD")
+            return self.repo.git.diff("--no-color")
         except GitCommandError as e:
             return f"Error getting diff: {e}"
 
@@ -179,13 +210,35 @@ class GitOps:
         """
         Check if there are staged changes ready to commit.
         Returns True if there are staged changes.
+
+        Uses pygit2 (optional) to compare the index against HEAD without
+        spawning git; falls back to `git diff --cached --quiet` otherwise.
         """
+        native = self._get_native_repo()
+        if native is not None:
+            try:
+                native.index.read()
+                if native.head_is_unborn:
+                    return len(native.index) > 0
+                return native.diff("HEAD", cached=True).stats.files_changed > 0
+            except Exception:
+                pass  # Fall through to the git CLI
+
         try:
-            # git diff --cached --quiet returns exit code 0 if no changes, 1 if changes
-            self.repo.git.diff("--cached", "--quiet")
-            return False  # No changes (exit code 0)
+            # git diff --cached --quiet returns exit code 0 if no changes, 1 if changes.
+            # Only the exit code matters, so skip pipe setup and let stdio go to devnull.
+            # `-C` instead of cwd= keeps the call eligible for posix_spawn.
+            result = subprocess.run(
+                [_GIT, "-C", self.repo.working_dir, "diff", "--cached", "--quiet"],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                close_fds=False,
+                check=False,
+                timeout=GIT_TIMEOUT,
+            )
+            return result.returncode != 0  # Has changes (exit code 1 or error)
         except Exception:
-            return True  # Has changes (exit code 1 or error)
+            return True
 
 
     def get_staged_diff(self) -> str:
@@ -196,6 +249,56 @@ class GitOps:
         try:
             if not self.has_staged_changes():
                 return ""
-            return self.repo.git.diff("--cached")
+            return self.repo.git.diff("--no-color", "--cached")
         except Exception as e:
-            return ""
\ No newline at end of file
+            return ""
+
+    def get_staged_diff_with_files(self) -> Tuple[str, List[str]]:
+        """
+        Get the staged patch and the staged file paths from one git call.
+        Returns ("", []) if nothing is staged or git fails.
+
+        `--raw -p` prints one ":<modes> <shas> <status>\t<path>" line per
+        file, a blank line, then the patch. `--no-color` keeps a user's
+        `color.ui = always` from putting escape codes into the parsed lines.
+        """
+        try:
+            output = self.repo.git.diff("--no-color", "--cached", "--raw", "-p")
+        except GitCommandError:
+            return "", []
+
+        raw, _, patch = output.partition("\n\n")
+        # Renames/copies list "old\tnew"; the last field is the staged path
+        files = [line.split("\t")[-1] for line in raw.splitlines() if line.startswith(":")]
+        return patch, files
+
+    def staged_changes_are_whitespace_only(self) -> bool:
+        """
+        Check whether every staged change disappears when whitespace and
+        blank lines are ignored. False if git fails.
+        """
+        try:
+            return not self.repo.git.diff(
+                "--no-color", "--cached", "-w", "--ignore-blank-lines", "--numstat"
+            )
+        except GitCommandError:
+            return False
+
+    def get_staged_tree(self) -> Optional[str]:
+        """
+        Tree hash the next commit will have if the index is committed as is
+        (`git write-tree`). None if git fails, e.g. during a conflicted merge.
+        """
+        try:
+            return self.repo.git.write_tree()
+        except GitCommandError:
+            return None
+
+
+@lru_cache(maxsize=8)
+def get_git_ops(repo_path: str) -> GitOps:
+    """
+    Returns a process-wide GitOps instance for the given repository path,
+    so one CLI run opens and parses the repository only once.
+    """
+    return GitOps(repo_path)
@@ -1,13 +1,32 @@
 import ast
+import hashlib
 import os
 import sys
+import tempfile
+import threading
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Any, Tuple
-from dataclasses import dataclass, field
+from typing import List, Dict, Set, Optional, Any, Tuple, Iterable
+from dataclasses import dataclass, field, asdict
 from enum import Enum
 import json
 from collections import defaultdict
 
+from src.utils.io import read_many
+from src.utils.workspace import cache_path
+
+# Bump when the extracted fields change so stale cache files are ignored
+PARSE_CACHE_VERSION = 1
+PARSE_CACHE_DIR = "parse"  # Under the user cache directory, one file per repository
+PARSE_CACHE_ENTRIES = 2000
+# Architect and Steward save the same cache file from parallel graph nodes
+_cache_save_lock = threading.Lock()
+
+
+def parse_cache_path(repo_path: str) -> str:
+    """Parse cache file for a repository, kept outside its work tree."""
+    repo_id = hashlib.sha1(os.path.abspath(repo_path).encode('utf-8')).hexdigest()
+    return cache_path(os.path.join(PARSE_CACHE_DIR, f"{repo_id}.json"))
+
 
 class ImportType(Enum):
     """Types of imports found in Python code."""
@@ -116,7 +135,9 @@ class PythonCodeParser:
                  repo_root: str,
                  ignore_patterns: Optional[List[str]] = None,
                  max_file_size: int = 10_000_000,
-                 strict_mode: bool = False):
+                 strict_mode: bool = False,
+                 files: Optional[Iterable[str]] = None,
+                 cache_file: Optional[str] = None):
         """
         Initialize the parser.
         
@@ -125,6 +146,11 @@ class PythonCodeParser:
             ignore_patterns: Patterns to ignore (e.g., ['__pycache__', 'venv'])
             max_file_size: Maximum file size to parse (in bytes)
             strict_mode: If True, treat warnings as errors
+            files: Python files to index (relative or absolute). When given,
+                   the repository walk is skipped.
+            cache_file: JSON file of earlier analyses keyed by file content
+                        hash; unchanged files are restored instead of re-parsed.
+                        Call save_cache() to persist new analyses.
         """
         self.repo_root = Path(repo_root).resolve()
         self.ignore_patterns = ignore_patterns or [
@@ -141,6 +167,12 @@ class PythonCodeParser:
         self.dependency_graph: Dict[str, Set[str]] = defaultdict(set)
         self.reverse_dependency_graph: Dict[str, Set[str]] = defaultdict(set)
         self.package_map: Dict[str, List[str]] = defaultdict(list)  # package -> modules
+        self._prefetched: Dict[str, bytes] = {}  # abs_path -> raw bytes awaiting analysis
+        self._index: Optional[Dict[str, Tuple[List[str], int]]] = None
+        self.cache_file = cache_file
+        self._cache: Dict[str, dict] = self._load_cache()  # content sha1 -> analysis record
+        self._cache_dirty = False
+        self._cache_used: Set[str] = set()  # digests restored or added by this parser
         
         # Statistics
         self.stats = {
@@ -153,7 +185,7 @@ class PythonCodeParser:
         }
         
         # Index the repository
-        self._index_repository()
+        self._index_repository(files)
 
     def _should_ignore(self, path: Path) -> bool:
         """Check if a path should be ignored."""
@@ -166,48 +198,57 @@ class PythonCodeParser:
                 return True
         return False
 
-    def _index_repository(self) -> None:
+    def _walk_python_files(self) -> Iterable[Path]:
+        """Yield every non-ignored .py file under repo_root."""
+        for root, dirs, files in os.walk(self.repo_root):
+            # Filter ignored directories in-place
+            dirs[:] = [d for d in dirs if not self._should_ignore(Path(root) / d)]
+            
+            for file in files:
+                if file.endswith('.py'):
+                    yield Path(root) / file
+
+    def _index_repository(self, files: Optional[Iterable[str]] = None) -> None:
         """
         Index all Python files in the repository.
         Builds comprehensive module maps for import resolution.
+        
+        Args:
+            files: Pre-computed file list (e.g. from `git ls-files`); skips the walk
         """
         print(f"Indexing repository: {self.repo_root}")
         
-        for root, dirs, files in os.walk(self.repo_root):
-            # Filter ignored directories in-place
-            dirs[:] = [d for d in dirs if not self._should_ignore(Path(root) / d)]
+        if files is None:
+            candidates = self._walk_python_files()
+        else:
+            candidates = (self._abs_path(f) for f in files if f.endswith('.py'))
+        
+        for abs_path in candidates:
+            if self._should_ignore(abs_path):
+                continue
             
-            for file in files:
-                if not file.endswith('.py'):
-                    continue
-                
-                abs_path = Path(root) / file
-                
-                if self._should_ignore(abs_path):
-                    continue
-                
-                # Check file size
-                try:
-                    if abs_path.stat().st_size > self.max_file_size:
-                        print(f"Skipping large file: {abs_path}")
-                        continue
-                except OSError as e:
-                    print(f"Error accessing {abs_path}: {e}")
+            # Check file size
+            try:
+                if abs_path.stat().st_size > self.max_file_size:
+                    print(f"Skipping large file: {abs_path}")
                     continue
+            except OSError as e:
+                print(f"Error accessing {abs_path}: {e}")
+                continue
+            
+            self.stats['total_files'] += 1
+            
+            # Convert to module notation
+            module_name = self._path_to_module(abs_path)
+            if module_name:
+                self.module_map[module_name] = str(abs_path)
                 
-                self.stats['total_files'] += 1
-                
-                # Convert to module notation
-                module_name = self._path_to_module(abs_path)
-                if module_name:
-                    self.module_map[module_name] = str(abs_path)
-                    
-                    # Track package hierarchy
-                    parts = module_name.split('.')
-                    for i in range(len(parts)):
-                        package = '.'.join(parts[:i+1])
-                        if package not in self.package_map:
-                            self.package_map[package] = []
+                # Track package hierarchy
+                parts = module_name.split('.')
+                for i in range(len(parts)):
+                    package = '.'.join(parts[:i+1])
+                    if package not in self.package_map:
+                        self.package_map[package] = []
         
         print(f"Indexed {self.stats['total_files']} Python files")
         print(f"Created {len(self.module_map)} module mappings")
@@ -245,6 +286,26 @@ class PythonCodeParser:
         
         return None
 
+    def _abs_path(self, file_path: str) -> Path:
+        """Resolve a repo-relative or absolute path."""
+        if Path(file_path).is_absolute():
+            return Path(file_path)
+        return (self.repo_root / file_path).resolve()
+
+    def prefetch(self, files: List[str]) -> None:
+        """
+        Read not-yet-analyzed files concurrently so analyze_file() can
+        skip its own blocking read.
+        
+        Args:
+            files: File paths (relative to repo_root or absolute)
+        """
+        pending = [
+            str(self._abs_path(f)) for f in files
+            if f not in self.file_analyses
+        ]
+        self._prefetched.update(read_many(pending))
+
     def analyze_file(self, file_path: str) -> FileAnalysis:
         """
         Perform comprehensive analysis on a single Python file.
@@ -256,10 +317,7 @@ class PythonCodeParser:
             FileAnalysis object with complete information
         """
         # Normalize path
-        if Path(file_path).is_absolute():
-            abs_path = Path(file_path)
-        else:
-            abs_path = (self.repo_root / file_path).resolve()
+        abs_path = self._abs_path(file_path)
         
         # Get relative path for storage
         try:
@@ -278,9 +336,17 @@ class PythonCodeParser:
         analysis.module_name = self._path_to_module(abs_path)
         
         try:
-            # Read file content
-            with open(abs_path, 'rb') as f:
-                raw_content = f.read()
+            # Read file content (already in memory if prefetched)
+            raw_content = self._prefetched.pop(str(abs_path), None)
+            if raw_content is None:
+                with open(abs_path, 'rb') as f:
+                    raw_content = f.read()
+            
+            digest = hashlib.sha1(raw_content).hexdigest() if self.cache_file else None
+            if digest and self._restore_cached(digest, analysis):
+                self.file_analyses[rel_path] = analysis
+                self._index = None
+                return analysis
             
             # Detect encoding
             try:
@@ -314,6 +380,10 @@ class PythonCodeParser:
                 self._resolve_dependencies(analysis)
                 
                 self.stats['parsed_files'] += 1
+                if digest:
+                    self._cache[digest] = self._analysis_record(analysis)
+                    self._cache_used.add(digest)
+                    self._cache_dirty = True
                 
             except SyntaxError as e:
                 analysis.errors.append(f"Syntax error at line {e.lineno}: {e.msg}")
@@ -324,11 +394,138 @@ class PythonCodeParser:
             self.stats['failed_files'] += 1
         
         self.file_analyses[rel_path] = analysis
+        self._index = None
         return analysis
 
+    def _load_cache(self) -> Dict[str, dict]:
+        """Read the parse cache; a missing, corrupt or outdated file gives an empty cache."""
+        if not self.cache_file:
+            return {}
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('version') != PARSE_CACHE_VERSION:
+            return {}
+        entries = data.get('entries')
+        return entries if isinstance(entries, dict) else {}
+
+    def save_cache(self) -> None:
+        """
+        Persist analyses parsed since the cache was loaded, merged into what
+        is on disk now so a parser saving the same file meanwhile keeps its
+        entries. Failures are ignored.
+        """
+        if not self.cache_file or not self._cache_dirty:
+            return
+        cache_dir = os.path.dirname(os.path.abspath(self.cache_file))
+        with _cache_save_lock:
+            self._write_cache(cache_dir)
+
+    def _write_cache(self, cache_dir: str) -> None:
+        # Start from the file as it is now; only this parser's entries move to the end
+        entries = self._load_cache()
+        for digest in self._cache_used:
+            entries.pop(digest, None)
+            entries[digest] = self._cache[digest]
+        # Restored and new entries sit at the end, so trimming drops the least recently used
+        entries = dict(list(entries.items())[-PARSE_CACHE_ENTRIES:])
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Write-then-rename: Architect and Steward may save concurrently
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': PARSE_CACHE_VERSION, 'entries': entries}, f)
+            os.replace(tmp_path, self.cache_file)
+            self._cache_dirty = False
+        except OSError:
+            pass
+
+    @staticmethod
+    def _analysis_record(analysis: FileAnalysis) -> dict:
+        """The content-derived part of an analysis, as JSON-safe data."""
+        return {
+            'imports': [dict(asdict(imp), import_type=imp.import_type.value) for imp in analysis.imports],
+            'functions': [asdict(func) for func in analysis.functions],
+            'classes': [asdict(cls) for cls in analysis.classes],
+            'global_variables': analysis.global_variables,
+            'metrics': asdict(analysis.metrics),
+            'warnings': analysis.warnings,
+            'encoding': analysis.encoding,
+            'has_main_block': analysis.has_main_block,
+            'shebang': analysis.shebang,
+        }
+
+    def _restore_cached(self, digest: str, analysis: FileAnalysis) -> bool:
+        """
+        Fill analysis from the cache entry for this content hash.
+        
+        Dependencies are resolved again, since they depend on the rest of the
+        repository. The AST is not cached; find_unused_imports() re-parses.
+        
+        Returns:
+            False on a miss or an unreadable entry (which is dropped).
+        """
+        record = self._cache.pop(digest, None)
+        if record is None:
+            return False
+        try:
+            imports = [
+                ImportStatement(**dict(imp, import_type=ImportType(imp['import_type'])))
+                for imp in record['imports']
+            ]
+            functions = [FunctionInfo(**func) for func in record['functions']]
+            classes = [ClassInfo(**cls) for cls in record['classes']]
+            metrics = CodeMetrics(**record['metrics'])
+            global_variables = list(record['global_variables'])
+            warnings = list(record['warnings'])
+        except (KeyError, TypeError, ValueError):
+            return False
+        
+        self._cache[digest] = record
+        self._cache_used.add(digest)
+        analysis.imports = imports
+        analysis.functions = functions
+        analysis.classes = classes
+        analysis.metrics = metrics
+        analysis.global_variables = global_variables
+        analysis.warnings = warnings
+        analysis.encoding = record.get('encoding', 'utf-8')
+        analysis.has_main_block = bool(record.get('has_main_block'))
+        analysis.shebang = record.get('shebang')
+        self._resolve_dependencies(analysis)
+        
+        self.stats['total_imports'] += len(imports)
+        self.stats['total_functions'] += len(functions)
+        self.stats['total_classes'] += len(classes)
+        self.stats['parsed_files'] += 1
+        return True
+
+    @property
+    def index(self) -> Dict[str, Tuple[List[str], int]]:
+        """
+        One-shot view of every analyzed file, shared by the diagram generators.
+        
+        Returns:
+            Mapping of file path -> (sorted dependencies, cyclomatic complexity).
+            Built once and reused until another file is analyzed.
+        """
+        if self._index is None:
+            self._index = {
+                path: (sorted(analysis.dependencies), analysis.metrics.cyclomatic_complexity)
+                for path, analysis in self.file_analyses.items()
+            }
+        return self._index
+
     def _extract_imports(self, tree: ast.AST, analysis: FileAnalysis, path: Path) -> None:
         """Extract all import statements with detailed information."""
+        # ast.walk is breadth-first, so a node's parent is recorded before the node is reached
+        parents: Dict[ast.AST, ast.AST] = {}
         for node in ast.walk(tree):
+            for child in ast.iter_child_nodes(node):
+                parents[child] = node
+            
             if isinstance(node, ast.Import):
                 # Handle: import x, import x as y
                 for alias in node.names:
@@ -367,13 +564,10 @@ class PythonCodeParser:
                 
                 # Check if import is conditional (inside if/try block)
                 parent_type = None
-                for parent in ast.walk(tree):
-                    for child in ast.iter_child_nodes(parent):
-                        if child == node:
-                            if isinstance(parent, (ast.If, ast.Try)):
-                                parent_type = type(parent).__name__
-                                import_type = ImportType.CONDITIONAL
-                            break
+                parent = parents.get(node)
+                if isinstance(parent, (ast.If, ast.Try)):
+                    parent_type = type(parent).__name__
+                    import_type = ImportType.CONDITIONAL
                 
                 import_stmt = ImportStatement(
                     module=node.module,
@@ -440,6 +634,7 @@ class PythonCodeParser:
 
     def _extract_classes(self, tree: ast.AST, analysis: FileAnalysis) -> None:
         """Extract all class definitions with metadata."""
+        functions_by_location = {(func.name, func.line_number): func for func in analysis.functions}
         for node in ast.walk(tree):
             if isinstance(node, ast.ClassDef):
                 # Get base classes
@@ -460,9 +655,9 @@ class PythonCodeParser:
                     if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
                         methods.append(item.name)
                         # Mark functions as methods
-                        for func in analysis.functions:
-                            if func.name == item.name and func.line_number == item.lineno:
-                                func.is_method = True
+                        func = functions_by_location.get((item.name, item.lineno))
+                        if func is not None:
+                            func.is_method = True
                 
                 # Get class attributes
                 attributes = []
@@ -534,7 +729,6 @@ class PythonCodeParser:
 
     def _calculate_complexity(self, tree: ast.AST, analysis: FileAnalysis) -> None:
         """Calculate overall complexity metrics."""
-        total_complexity = 0
         max_depth = 0
         
         def get_nesting_depth(node, depth=0):
@@ -546,10 +740,8 @@ class PythonCodeParser:
                 else:
                     get_nesting_depth(child, depth)
         
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                complexity = self._calculate_cyclomatic_complexity(node)
-                total_complexity += complexity
+        # _extract_functions has already scored every function in the file
+        total_complexity = sum(func.complexity for func in analysis.functions)
         
         get_nesting_depth(tree)
         
@@ -698,15 +890,18 @@ class PythonCodeParser:
             files = list(self.file_analyses.keys())
         
         graph = {}
+        self.prefetch(files)
         
         for file_path in files:
             if file_path not in self.file_analyses:
                 # Analyze if not already done
                 self.analyze_file(file_path)
-            
-            if file_path in self.file_analyses:
+        
+        index = self.index
+        for file_path in files:
+            if file_path in index:
                 analysis = self.file_analyses[file_path]
-                graph[file_path] = sorted(list(analysis.dependencies))
+                graph[file_path] = index[file_path][0]
                 
                 # Update forward and reverse graphs
                 self.dependency_graph[file_path] = analysis.dependencies
@@ -766,8 +961,14 @@ class PythonCodeParser:
             self.analyze_file(file_path)
         
         analysis = self.file_analyses.get(file_path)
-        if not analysis or not analysis.ast_tree:
+        if not analysis or (analysis.ast_tree is None and analysis.errors):
             return []
+        if analysis.ast_tree is None:
+            # Restored from the parse cache, which does not keep trees
+            try:
+                analysis.ast_tree = ast.parse(self._abs_path(file_path).read_bytes())
+            except (OSError, SyntaxError, ValueError):
+                return []
         
         # Collect all names used in the file
         used_names = set()
@@ -2,23 +2,41 @@
 Docstring for src.utils.config
 Updated for GitMentor branding and workspace pathing.
 """
-import yaml
 import os
+import threading
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+_MISSING = object()
+
+
+def _freeze(value: Any) -> Any:
+    """Recursively turn dicts into read-only MappingProxyType views."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    return value
+
 
 class Config:
     _instance = None
     _config_data = None
     _defaults = None
+    _lookups = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(Config, cls).__new__(cls)
-            cls._instance._load_config()
         return cls._instance
 
+    def _ensure_loaded(self):
+        """Parse config.yaml exactly once, on the first lookup."""
+        if self._config_data is None:
+            with self._lock:
+                if self._config_data is None:
+                    self._load_config()
+
     def _load_config(self):
         """
         Load configuration from config.yaml.
@@ -67,10 +85,22 @@ class Config:
 
         # Load config
         if not config_path.exists():
-            self._config_data = self._defaults
+            data = self._defaults
         else:
+            import yaml
             with open(config_path, "r") as f:
-                self._config_data = yaml.safe_load(f) or {}
+                data = yaml.safe_load(f) or {}
+
+        # Frozen, so values handed out by get() can't drift between callers
+        self._defaults = _freeze(self._defaults)
+        self._lookups = {}
+        self._config_data = _freeze(data)
+
+    def reset(self):
+        """Forget the loaded config so the next lookup reads config.yaml again."""
+        with self._lock:
+            self._config_data = None
+            self._lookups = None
 
     def get(self, path: str, default: Any = None) -> Any:
         """
@@ -80,25 +110,24 @@ class Config:
             cfg.get("llm.provider")
             cfg.get("llm.default.model")
         """
-        keys = path.split(".")
-
-        # First try loaded YAML
-        value = self._config_data
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return self._get_default(path, default)
-        return value
+        self._ensure_loaded()
+        value = self._lookups.get(path, _MISSING)
+        if value is _MISSING:
+            # First try loaded YAML, then the internal defaults
+            value = self._walk(self._config_data, path)
+            if value is _MISSING:
+                value = self._walk(self._defaults, path)
+            self._lookups[path] = value
+        return default if value is _MISSING else value
 
-    def _get_default(self, path: str, final_default: Any) -> Any:
-        keys = path.split(".")
-        value = self._defaults
-        for key in keys:
-            if isinstance(value, dict) and key in value:
+    @staticmethod
+    def _walk(data: Any, path: str) -> Any:
+        value = data
+        for key in path.split("."):
+            if isinstance(value, MappingProxyType) and key in value:
                 value = value[key]
             else:
-                return final_default
+                return _MISSING
         return value
 
 
@@ -0,0 +1,216 @@
+"""
+Warm worker for the GitMentor CLI.
+
+A single long-lived process keeps Python, Click, Rich and (after the first
+pipeline run) LangGraph plus the agents imported. CLI invocations connect
+over a Unix socket, send their argv and cwd, and stream the rendered output
+back, so repeated commands skip interpreter and import start-up.
+
+The worker keeps the environment it was started with (API keys, PATH), and
+it runs one request at a time because each request chdirs and redirects stdout.
+Output is sent in frames (`o` for text, `x` for the exit status), so the client
+can exit with the same code the command would have had in-process.
+"""
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, List, Optional
+
+SOCKET_NAME = "gitmentor.sock"
+SPAWN_TIMEOUT = 10.0
+
+# Frame header: one kind byte and the payload length
+_FRAME = struct.Struct(">cI")
+_OUTPUT = b"o"
+_EXIT = b"x"
+
+
+def is_supported() -> bool:
+    """Unix domain sockets and uids are required (not available on Windows)."""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def default_socket_path() -> str:
+    """
+    Socket location inside a directory only the current user can enter.
+
+    Uses $XDG_RUNTIME_DIR when set; otherwise creates (or verifies) a 0700
+    `gitmentor-<uid>` directory under the system temp dir.
+
+    Raises:
+        OSError: If the fallback directory exists but is not private to this user.
+    """
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+
+    directory = os.path.join(tempfile.gettempdir(), f"gitmentor-{os.getuid()}")
+    with contextlib.suppress(FileExistsError):
+        os.mkdir(directory, 0o700)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise OSError(f"{directory} is not a private directory owned by this user")
+    return os.path.join(directory, SOCKET_NAME)
+
+
+class _SocketWriter(io.TextIOBase):
+    """Text stream that forwards every write straight to the client socket."""
+
+    def __init__(self, wfile):
+        self._wfile = wfile
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._send(_OUTPUT, text.encode("utf-8"))
+        return len(text)
+
+    def exit(self, code: int) -> None:
+        """Send the command's exit status; the client stops reading after it."""
+        self._send(_EXIT, str(code).encode("ascii"))
+
+    def _send(self, kind: bytes, payload: bytes) -> None:
+        self._wfile.write(_FRAME.pack(kind, len(payload)) + payload)
+        self._wfile.flush()
+
+
+def _exit_code(exc: SystemExit) -> int:
+    """The status sys.exit() would have produced for exc."""
+    if exc.code is None:
+        return 0
+    return exc.code if isinstance(exc.code, int) else 1
+
+
+def serve(dispatch: Callable[[List[str]], int], socket_path: Optional[str] = None,
+          reset: Optional[Callable[[], None]] = None) -> None:
+    """
+    Serve CLI requests until interrupted.
+
+    Args:
+        dispatch: Callable that runs one CLI invocation for the given argv
+            and returns its exit code.
+        socket_path: Unix socket to listen on (default_socket_path() if omitted).
+        reset: Called before every request to drop per-process caches
+            (config, repository handles, consoles) left by the previous one.
+    """
+    socket_path = socket_path or default_socket_path()
+
+    class _RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline())
+            except ValueError:
+                return
+
+            writer = _SocketWriter(self.wfile)
+            previous_cwd = os.getcwd()
+            code = 1
+            try:
+                if reset is not None:
+                    reset()
+                os.chdir(request["cwd"])
+                with contextlib.redirect_stdout(writer), contextlib.redirect_stderr(writer):
+                    code = dispatch(request["argv"])
+            except (BrokenPipeError, ConnectionResetError):
+                return  # Client went away mid-run
+            except SystemExit as e:
+                code = _exit_code(e)
+            except Exception as e:
+                with contextlib.suppress(OSError):
+                    writer.write(f"Error: {e}\n")
+            finally:
+                os.chdir(previous_cwd)
+            with contextlib.suppress(OSError):
+                writer.exit(code)
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    with socketserver.UnixStreamServer(socket_path, _RequestHandler) as server:
+        os.chmod(socket_path, 0o600)
+        try:
+            server.serve_forever()
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(socket_path)
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(socket_path)
+        return sock
+    except OSError:
+        sock.close()
+        return None
+
+
+def _spawn(spawn_cmd: List[str], socket_path: str) -> Optional[socket.socket]:
+    """Start the worker in its own session and wait for its socket to accept."""
+    subprocess.Popen(
+        spawn_cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    deadline = time.monotonic() + SPAWN_TIMEOUT
+    while time.monotonic() < deadline:
+        sock = _connect(socket_path)
+        if sock:
+            return sock
+        time.sleep(0.05)
+    return None
+
+
+def forward(argv: List[str], spawn_cmd: Optional[List[str]] = None,
+            socket_path: Optional[str] = None) -> Optional[int]:
+    """
+    Run argv on the warm worker and stream its output to stdout.
+
+    Args:
+        argv: CLI arguments (without the program name).
+        spawn_cmd: Command that starts the worker if none is listening.
+        socket_path: Unix socket the worker listens on (default_socket_path() if omitted).
+
+    Returns:
+        The command's exit code, or None if the caller should fall back
+        to running the command in-process.
+    """
+    if not is_supported():
+        return None
+    try:
+        socket_path = socket_path or default_socket_path()
+    except OSError:
+        return None
+
+    sock = _connect(socket_path)
+    if sock is None and spawn_cmd:
+        sock = _spawn(spawn_cmd, socket_path)
+    if sock is None:
+        return None
+
+    with sock, sock.makefile("rb") as frames:
+        payload = json.dumps({"argv": list(argv), "cwd": os.getcwd()}) + "\n"
+        sock.sendall(payload.encode("utf-8"))
+        out = sys.stdout.buffer
+        while True:
+            header = frames.read(_FRAME.size)
+            if len(header) < _FRAME.size:
+                return 1  # Worker died before reporting a status
+            kind, length = _FRAME.unpack(header)
+            data = frames.read(length)
+            if kind == _EXIT:
+                return int(data)
+            out.write(data)
+            out.flush()
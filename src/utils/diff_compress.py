@@ -0,0 +1,48 @@
+"""
+Fit unified diffs into a prompt budget without blind truncation.
+"""
+from typing import List
+
+# Lines that carry structure or change; everything else is unchanged context
+_KEEP_PREFIXES = ("diff --git", "--- ", "+++ ", "@@", "+", "-", "new file", "deleted file",
+                  "rename ", "Binary files", "\\ No newline")
+_TRUNCATION_MARK = "... [truncated]"
+
+
+def compress_diff(diff: str, max_chars: int) -> str:
+    """
+    Shrink a unified diff to at most roughly max_chars.
+
+    Unchanged context lines and `index` lines are dropped first, since the
+    +/- lines and hunk headers carry the change. If that is still too long,
+    the diff is cut at a line boundary and the headers of the files that
+    did not fit are listed, so every touched file stays visible.
+
+    Args:
+        diff: Unified diff text (e.g. `git diff --cached`)
+        max_chars: Character budget for the result
+
+    Returns:
+        The diff itself if it already fits, otherwise the compressed form.
+    """
+    if len(diff) <= max_chars:
+        return diff
+
+    lines = [line for line in diff.splitlines() if line.startswith(_KEEP_PREFIXES)]
+    compact = "\n".join(lines)
+    if len(compact) <= max_chars:
+        return compact
+
+    kept: List[str] = []
+    used = 0
+    for i, line in enumerate(lines):
+        if used + len(line) + 1 > max_chars:
+            skipped = [l for l in lines[i:] if l.startswith("diff --git")]
+            kept.append(_TRUNCATION_MARK)
+            if skipped:
+                kept.append(f"Also changed ({len(skipped)} more file(s)):")
+                kept.extend(skipped)
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return "\n".join(kept)
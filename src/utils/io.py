@@ -0,0 +1,49 @@
+"""
+Batched file reads for repository scans.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+
+# File reads release the GIL, so a small pool keeps the disk queue busy
+MAX_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _read_bytes(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def read_many(paths: Iterable[str]) -> Dict[str, bytes]:
+    """
+    Read many files concurrently.
+
+    Args:
+        paths: File paths to read
+
+    Returns:
+        Mapping of path -> raw bytes. Unreadable files are left out so
+        callers can fall back to their own (error-reporting) read.
+    """
+    paths = list(dict.fromkeys(paths))
+    if len(paths) < 2:
+        contents = {}
+        for path in paths:
+            try:
+                contents[path] = _read_bytes(path)
+            except OSError:
+                pass
+        return contents
+
+    def _try_read(path: str):
+        try:
+            return path, _read_bytes(path)
+        except OSError:
+            return path, None
+
+    contents = {}
+    with ThreadPoolExecutor(max_workers=min(MAX_READ_WORKERS, len(paths))) as pool:
+        for path, data in pool.map(_try_read, paths):
+            if data is not None:
+                contents[path] = data
+    return contents
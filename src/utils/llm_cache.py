@@ -0,0 +1,144 @@
+"""
+Disk cache for LLM responses.
+
+Scribe's generators are deterministic in their inputs (diff, file list,
+intent), so a re-run over unchanged inputs can reuse the previous answer
+instead of paying for another model round trip. Entries live in the user
+cache directory under `gitmentor/llm/<sha256>.json`, outside the work tree,
+and expire after `llm.cache_ttl_hours` (default one week).
+"""
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+from src.utils.config import cfg
+from src.utils.workspace import cache_path
+
+CACHE_DIRNAME = "llm"
+# In-process layer in front of the files, for the warm worker's repeat runs
+MEMORY_ENTRIES = 64
+DEFAULT_TTL_HOURS = 24 * 7
+
+_memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+# Full mode drafts the README on a worker thread while the graph keeps running
+_memory_lock = threading.Lock()
+# Set by every pipeline run (see configure), so the warm worker never carries it over
+_lookups_enabled = True
+
+
+def configure(use_cache: bool = True) -> None:
+    """
+    Enable or bypass cache lookups for the current run.
+
+    With use_cache=False every load() misses, so each generator calls the
+    model; fresh responses are still stored and replace the old entries.
+    """
+    global _lookups_enabled
+    _lookups_enabled = use_cache
+
+
+def _cache_dir() -> str:
+    # Keys are built from the full prompt inputs, so entries are safe to share across repositories
+    return os.path.abspath(cache_path(CACHE_DIRNAME))
+
+
+def _remember(path: str, created: float, content: str) -> None:
+    with _memory_lock:
+        _memory[path] = (created, content)
+        _memory.move_to_end(path)
+        while len(_memory) > MEMORY_ENTRIES:
+            _memory.popitem(last=False)
+
+
+def _recall(path: str) -> Optional[Tuple[float, str]]:
+    with _memory_lock:
+        entry = _memory.get(path)
+        if entry is not None:
+            _memory.move_to_end(path)
+        return entry
+
+
+def cache_key(*parts: str) -> str:
+    """
+    Build a cache key from the inputs that determine a response.
+
+    Args:
+        parts: Prompt inputs (diff text, intent, model name, ...)
+
+    Returns:
+        Hex sha256 digest of the parts.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")  # Keep ("ab", "c") and ("a", "bc") apart
+    return digest.hexdigest()
+
+
+def _ttl_seconds() -> float:
+    return cfg.get("llm.cache_ttl_hours", DEFAULT_TTL_HOURS) * 3600
+
+
+def _expired(created: float) -> bool:
+    return time.time() - created > _ttl_seconds()
+
+
+def _prune(cache_dir: str) -> None:
+    """Delete entry files older than the TTL; entries whose inputs never recur are never loaded again."""
+    cutoff = time.time() - _ttl_seconds()
+    try:
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+
+def load(key: str) -> Optional[str]:
+    """Return the cached response text for key, or None on a miss, expiry or bypass."""
+    if not _lookups_enabled:
+        return None
+    path = os.path.join(_cache_dir(), f"{key}.json")
+    entry = _recall(path)
+    if entry is None:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            entry = (float(data["created"]), data["content"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        _remember(path, *entry)
+    created, content = entry
+    if _expired(created):
+        with _memory_lock:
+            _memory.pop(path, None)
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+        return None
+    return content
+
+
+def store(key: str, content: str) -> None:
+    """Persist content under key. Failures are ignored; the cache is best effort."""
+    cache_dir = _cache_dir()
+    created = time.time()
+    _remember(os.path.join(cache_dir, f"{key}.json"), created, content)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"created": created, "content": content}, f)
+        os.replace(tmp_path, os.path.join(cache_dir, f"{key}.json"))
+    except OSError:
+        pass
+    _prune(cache_dir)
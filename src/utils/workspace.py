@@ -39,6 +39,15 @@ def save_artifact(content: str, extension: str, prefix: Optional[str] = None) ->
         
     return filepath
 
+def cache_path(name: str) -> str:
+    """
+    Path of a file in the user cache directory ($XDG_CACHE_HOME/gitmentor,
+    ~/.cache/gitmentor by default). Caches live outside the work tree so a
+    `git add .` never stages them.
+    """
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "gitmentor", name)
+
 def load_artifact(filepath: str) -> str:
     """Reads artifact data from disk back into memory."""
     with open(filepath, "r", encoding="utf-8") as f: